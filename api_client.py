@@ -1,6 +1,57 @@
+import asyncio
+import httpx
+from collections import OrderedDict
 from openai import AsyncOpenAI
-from typing import List, Dict, Any, Optional
+from openai.types.chat import ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Callable
 from config import Config
+import json_utils
+
+# Shared clients so every OpenAIClient reuses the same keep-alive pool
+_http_client: Optional[httpx.AsyncClient] = None
+_openai_client: Optional[AsyncOpenAI] = None
+
+# Number of per-session extra_body payloads kept for reuse
+_EXTRA_BODY_CACHE_SIZE = 64
+
+
+def _get_http_client(config: Config) -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_conn,
+                max_keepalive_connections=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry
+            ),
+            timeout=config.http_timeout
+        )
+    return _http_client
+
+
+def _get_openai_client(config: Config) -> AsyncOpenAI:
+    """Get the shared OpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None or _http_client is None or _http_client.is_closed:
+        _openai_client = AsyncOpenAI(
+            api_key=config.openai_api_key,
+            base_url=config.api_url,
+            http_client=_get_http_client(config),
+            max_retries=config.max_retries
+        )
+    return _openai_client
+
+
+async def shutdown_shared_client() -> None:
+    """Close the shared clients and release pooled connections."""
+    global _http_client, _openai_client
+    http_client = _http_client
+    _http_client = None
+    _openai_client = None
+    if http_client is not None and not http_client.is_closed:
+        await http_client.aclose()
 
 
 class OpenAIClient:
@@ -8,39 +59,148 @@ class OpenAIClient:
 
     def __init__(self, config: Config):
         self.config = config
-        self.client = AsyncOpenAI(
-            api_key=config.openai_api_key,
-            base_url=config.api_url
-        )
+        # Bound in-flight requests so concurrent callers don't trip rate limits
+        self._semaphore = asyncio.Semaphore(config.max_concurrency)
+        self._extra_bodies: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Get the shared OpenAI client, recreating it if it was shut down."""
+        return _get_openai_client(self.config)
+
+    def _extra_body(
+        self,
+        session_id: str,
+        tools: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Get the extra_body payload for a session, reusing the cached dict.
+
+        A reset session gets a new id and therefore a fresh entry, and the
+        oldest entries are evicted so short-lived goal sessions don't pile up.
+        The returned dict is shared and must not be mutated.
+        """
+        key = (session_id, id(tools) if tools else 0)
+        extra_body = self._extra_bodies.get(key)
+        if extra_body is not None:
+            self._extra_bodies.move_to_end(key)
+            return extra_body
+
+        extra_body = {"litellm_session_id": session_id}
+        if tools:
+            # The schemas are static, so send them through extra_body to skip
+            # the SDK's per-request deep transform of the typed tools param
+            extra_body["tools"] = tools
+            extra_body["tool_choice"] = "auto"
+
+        self._extra_bodies[key] = extra_body
+        if len(self._extra_bodies) > _EXTRA_BODY_CACHE_SIZE:
+            self._extra_bodies.popitem(last=False)
+        return extra_body
+
+    def _build_request_params(
+        self,
+        messages: List[Dict[str, Any]],
+        session_id: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the keyword arguments for a chat completion request."""
+        request_params = {
+            "model": self.config.model_name,
+            "messages": messages,
+            "temperature": temperature or self.config.temperature,
+            "extra_body": self._extra_body(session_id, tools)
+        }
+
+        if response_format:
+            request_params["response_format"] = response_format
+
+        return request_params
 
     async def send_chat_completion(
         self,
         messages: List[Dict[str, Any]],
         session_id: str,
         tools: Optional[List[Dict[str, Any]]] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> Any:
         """Send a chat completion request to OpenAI API."""
         try:
-            request_params = {
-                "model": self.config.model_name,
-                "messages": messages,
-                "temperature": temperature or self.config.temperature,
-                "extra_body": {
-                    "litellm_session_id": session_id
-                }
-            }
-
-            if tools:
-                request_params["tools"] = tools
-                request_params["tool_choice"] = "auto"
-
-            response = await self.client.chat.completions.create(**request_params)
+            request_params = self._build_request_params(messages, session_id, tools, temperature, response_format)
+
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(**request_params)
             return response
 
         except Exception as e:
             raise Exception(f"API request failed: {str(e)}")
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        session_id: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream a chat completion, yielding ("content", text) and ("tool_call", tool_call) events.
+
+        Tool calls are yielded as soon as they are complete, which happens when
+        the stream moves on to the next tool call or ends, so callers can start
+        executing them while the rest of the response is still decoding.
+        """
+        try:
+            request_params = self._build_request_params(messages, session_id, tools, temperature)
+            pending: Dict[int, Dict[str, Any]] = {}
+
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(stream=True, **request_params)
+                try:
+                    async for chunk in response:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta
+
+                        if delta.content:
+                            yield "content", delta.content
+
+                        for tool_delta in delta.tool_calls or []:
+                            if tool_delta.index not in pending:
+                                # A new tool call starts, so all earlier ones are complete
+                                for index in sorted(pending):
+                                    if index < tool_delta.index and not pending[index]["done"]:
+                                        pending[index]["done"] = True
+                                        yield "tool_call", self._make_tool_call(pending[index])
+                                pending[tool_delta.index] = {"id": "", "name": "", "arguments": "", "done": False}
+
+                            partial = pending[tool_delta.index]
+                            if tool_delta.id:
+                                partial["id"] = tool_delta.id
+                            if tool_delta.function:
+                                partial["name"] += tool_delta.function.name or ""
+                                partial["arguments"] += tool_delta.function.arguments or ""
+                finally:
+                    # Also runs when the caller stops iterating early, releasing
+                    # the connection and the semaphore slot
+                    await response.close()
+
+            for index in sorted(pending):
+                if not pending[index]["done"]:
+                    yield "tool_call", self._make_tool_call(pending[index])
+
+        except Exception as e:
+            raise Exception(f"API request failed: {str(e)}")
+
+    @staticmethod
+    def _make_tool_call(partial: Dict[str, Any]) -> ChatCompletionMessageToolCall:
+        """Build a tool call object from accumulated stream deltas."""
+        return ChatCompletionMessageToolCall(
+            id=partial["id"],
+            type="function",
+            function=Function(name=partial["name"], arguments=partial["arguments"])
+        )
+
     async def send_follow_up_request(
         self,
         messages: List[Dict[str, Any]],
@@ -49,19 +209,128 @@ class OpenAIClient:
     ) -> Any:
         """Send a follow-up request after tool execution."""
         try:
-            response = await self.client.chat.completions.create(
-                model=self.config.model_name,
-                messages=messages,
-                temperature=temperature or self.config.temperature,
-                extra_body={
-                    "litellm_session_id": session_id
-                }
-            )
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(
+                    model=self.config.model_name,
+                    messages=messages,
+                    temperature=temperature or self.config.temperature,
+                    extra_body=self._extra_body(session_id)
+                )
             return response
 
         except Exception as e:
             raise Exception(f"Follow-up API request failed: {str(e)}")
 
+    async def send_streaming_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        session_id: str,
+        temperature: Optional[float] = None,
+        stop_when: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Stream a text completion and return its content, stopping early once stop_when is satisfied."""
+        try:
+            request_params = self._build_request_params(messages, session_id, temperature=temperature)
+            content = ""
+
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(stream=True, **request_params)
+                try:
+                    async for chunk in response:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            content += chunk.choices[0].delta.content
+                            if stop_when is not None and stop_when(content):
+                                break
+                finally:
+                    # Closing the stream aborts any generation still in flight
+                    await response.close()
+
+            return content
+
+        except Exception as e:
+            raise Exception(f"API request failed: {str(e)}")
+
+    async def send_follow_up_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        session_id: str,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """Send a follow-up request after tool execution, yielding content as it arrives."""
+        try:
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(
+                    model=self.config.model_name,
+                    messages=messages,
+                    temperature=temperature or self.config.temperature,
+                    stream=True,
+                    extra_body=self._extra_body(session_id)
+                )
+                try:
+                    async for chunk in response:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                finally:
+                    await response.close()
+
+        except Exception as e:
+            raise Exception(f"Follow-up API request failed: {str(e)}")
+
+    async def run_batch(self, requests: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Run chat completion request bodies through the Batch API and wait for them.
+
+        Takes request bodies keyed by custom id and returns the response body
+        of each request that succeeded, keyed the same way.
+        """
+        try:
+            lines = [
+                json_utils.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+                for custom_id, body in requests.items()
+            ]
+            batch_file = await self.client.files.create(
+                file=("requests.jsonl", "\n".join(lines).encode('utf-8')),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window=self.config.batch_completion_window
+            )
+
+            # The batch runs remotely, so its status can only be polled
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(self.config.batch_poll_interval)
+                batch = await self.client.batches.retrieve(batch.id)
+
+            if batch.status != "completed" or not batch.output_file_id:
+                raise Exception(f"batch {batch.id} ended with status {batch.status}")
+
+            output = await self.client.files.content(batch.output_file_id)
+            bodies = {}
+            for line in output.content.splitlines():
+                if not line.strip():
+                    continue
+                result = json_utils.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") == 200:
+                    bodies[result["custom_id"]] = response["body"]
+            return bodies
+
+        except Exception as e:
+            raise Exception(f"Batch API request failed: {str(e)}")
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the API host so the first real request skips the handshake."""
+        try:
+            await _get_http_client(self.config).head(f"{self.config.api_url.rstrip('/')}/models")
+        except Exception:
+            # Warming up is best effort; the first request simply connects itself
+            pass
+
+    async def aclose(self) -> None:
+        """Close the shared clients and release pooled connections."""
+        await shutdown_shared_client()
+
     def get_model_name(self) -> str:
         """Get the current model name."""
         return self.config.model_name
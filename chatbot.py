@@ -1,18 +1,30 @@
-import json
-from config import Config
+import asyncio
+import json_utils
+from config import get_config
 from session import Session
 from api_client import OpenAIClient
 from goal_executor import GoalExecutor
 from tools import FileTools
 from logger import NexusLogger
 
+# Tool schemas and names are static, so build them once per process
+_TOOLS = FileTools.SCHEMAS
+_TOOL_NAMES = tuple(tool['function']['name'] for tool in _TOOLS)
+
+# Read-only tools whose successful result can be shown to the user as-is
+_TERMINAL_TOOLS = {
+    "read_file": lambda result: result["content"],
+    "list_directory": lambda result: "\n".join(item["name"] for item in result["items"]),
+    "get_current_directory": lambda result: result["current_directory"],
+}
+
 
 class Chatbot:
     """Main chatbot orchestrator - coordinates between different modules."""
 
     def __init__(self):
-        self.config = Config()
-        self.session = Session()
+        self.config = get_config()
+        self.session = Session(self.config.model_name)
         self.api_client = OpenAIClient(self.config)
         self.file_tools = FileTools()
         self.logger = NexusLogger()
@@ -22,98 +34,249 @@ class Chatbot:
             self.logger,
             self.config
         )
-        self.tools = FileTools.get_tool_schemas()
+        self.tools = _TOOLS
+        self._warm_up_task = None
+        self._summary_task = None
+
+    async def __aenter__(self):
+        # Connect to the API host while the user types the first message
+        if self.config.prewarm_connection:
+            self._warm_up_task = asyncio.create_task(self.api_client.warm_up())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Flush pending logs and release network and file resources."""
+        for task in (self._warm_up_task, self._summary_task):
+            if task is not None and not task.done():
+                task.cancel()
+        await self.logger.flush()
+        await self.api_client.aclose()
+        self.file_tools.close()
 
     async def send_message(self, message):
         """Send a message to the chatbot and get a response."""
+        return "".join([chunk async for chunk in self.stream_message(message)])
+
+    async def stream_message(self, message):
+        """Send a message to the chatbot and yield the response as it arrives."""
+        # Skip the API round-trip entirely for empty or whitespace-only input
+        message = message.strip() if message else ""
+        if not message:
+            return
+
         # Add user message to session
         self.session.add_user_message(message)
 
+        # Stream the response, starting each tool call as soon as it is complete
+        content_parts = []
+        tool_calls = []
+        pending = []
         try:
-            # Send request to API with tools
-            response = await self.api_client.send_chat_completion(
-                messages=self.session.get_conversation_history(),
+            async for kind, payload in self.api_client.stream_chat_completion(
+                messages=self._windowed_history(),
                 session_id=self.session.session_id,
                 tools=self.tools
+            ):
+                if kind == "content":
+                    content_parts.append(payload)
+                    yield payload
+                else:
+                    tool_calls.append(payload)
+                    FileTools.dispatch_ordered(payload, pending, self._run_tool)
+
+            # Add assistant's response to session
+            self.session.add_assistant_message("".join(content_parts) or None, tool_calls)
+
+            # Check if there are tool calls
+            if tool_calls:
+                async for chunk in self._handle_tool_calls(tool_calls, pending):
+                    yield chunk
+
+        except Exception as e:
+            yield f"Error: {str(e)}"
+            return
+        finally:
+            # Tool calls already started when the stream failed or the caller
+            # stopped reading must not keep running unobserved
+            await FileTools.cancel_pending(pending)
+
+        self._schedule_summary()
+
+    def _schedule_summary(self):
+        """Start folding older turns into a summary in the background once the history is too long.
+
+        The summary request runs while the user reads the reply and types the
+        next message, so the turn itself never waits on it.
+        """
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+
+        threshold = self.config.summary_threshold_chars
+        if threshold <= 0 or self.session.get_content_length() <= threshold:
+            return
+
+        span = self.session.get_summarizable_range(self.config.summary_keep_turns)
+        if span is None:
+            return
+
+        # Only pay for a summary once enough new turns sit outside the kept
+        # ones; when the kept turns alone are over the threshold, this stops
+        # every later turn from re-summarizing a single new turn
+        start, end = span
+        history = self.session.conversation_history
+        new_start = start + 1 if history[start]["role"] == "system" else start
+        if self.session.get_content_length(new_start, end) < threshold // 2:
+            return
+
+        self._summary_task = asyncio.create_task(self._summarize_history(start, end))
+
+    async def _summarize_history(self, start, end):
+        """Replace history[start:end] with a summary, unless the history changed meanwhile."""
+        history = self.session.conversation_history
+        first, last = history[start], history[end - 1]
+        transcript = "\n".join(
+            f"{msg['role']}: {(msg.get('content') or '')[:2000]}"
+            for msg in history[start:end]
+            if msg.get("content")
+        )
+        temp_messages = [
+            {"role": "system", "content": "Summarize the conversation below in a compact paragraph. Keep facts, decisions, file names and open questions; drop pleasantries."},
+            {"role": "user", "content": transcript}
+        ]
+
+        try:
+            response = await self.api_client.send_chat_completion(
+                messages=temp_messages,
+                session_id=self.session.session_id,
+                temperature=0.2
             )
+        except Exception as e:
+            # Keep the full history; the token window still bounds the request size
+            self.logger.warning(f"Could not summarize conversation history: {str(e)}")
+            return
 
-            # Get assistant's message
-            assistant_message = response.choices[0].message
+        summary = response.choices[0].message.content
+        # New turns only append, but a cleared or restored history must not be spliced into
+        current = self.session.conversation_history
+        if summary and current is history and len(current) >= end and current[start] is first and current[end - 1] is last:
+            self.session.replace_with_summary(start, end, summary)
 
-            # Add assistant's response to session
-            self.session.add_assistant_message(
-                assistant_message.content,
-                assistant_message.tool_calls
+    async def send_messages_batch(self, messages):
+        """Answer several independent queries with one API request per batch."""
+        batch_size = max(1, self.config.row_marshal_batch)
+        batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+        replies = await asyncio.gather(*(self._send_batch(batch) for batch in batches))
+        return [reply for batch_replies in replies for reply in batch_replies]
+
+    async def _send_batch(self, queries):
+        """Send one row-marshaled batch of queries and split the replies."""
+        numbered = "\n\n".join(f"### Query {i}\n{query}" for i, query in enumerate(queries, 1))
+        temp_messages = [
+            {"role": "system", "content": (
+                f"Answer each of the following {len(queries)} queries independently. "
+                f"Respond with only a JSON array of {len(queries)} strings, one answer per query, in order."
+            )},
+            {"role": "user", "content": numbered}
+        ]
+
+        try:
+            response = await self.api_client.send_chat_completion(
+                messages=temp_messages,
+                session_id=self.session.session_id
             )
+            replies = json_utils.loads(self._strip_code_fence(response.choices[0].message.content or ""))
 
-            # Check if there are tool calls
-            if assistant_message.tool_calls:
-                return await self._handle_tool_calls(assistant_message.tool_calls)
+            if not isinstance(replies, list) or len(replies) != len(queries):
+                raise ValueError(f"expected a JSON array of {len(queries)} replies")
 
-            return assistant_message.content
+            return [reply if isinstance(reply, str) else json_utils.dumps(reply) for reply in replies]
 
         except Exception as e:
-            return f"Error: {str(e)}"
+            return [f"Error: {str(e)}"] * len(queries)
 
-    async def _handle_tool_calls(self, tool_calls):
-        """Handle tool calls and return the final response."""
-        # Execute each tool call with minimal logging
-        tool_results = []
-        for tool_call in tool_calls:
-            # Execute the tool
-            result = self.file_tools.execute_tool(tool_call)
+    @staticmethod
+    def _strip_code_fence(text):
+        """Remove a surrounding markdown code fence from a model reply."""
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+            if text.rstrip().endswith("```"):
+                text = text.rstrip()[:-3]
+        return text
 
-            # Log tool usage with result using logger
-            self._log_tool_execution(tool_call, result)
+    async def _handle_tool_calls(self, tool_calls, pending):
+        """Wait for dispatched tool calls and stream the final response as it arrives."""
+        # A lone tool call needs no gather bookkeeping
+        if len(pending) == 1:
+            results = [await pending[0]]
+        else:
+            results = await asyncio.gather(*pending)
 
-            # Add tool result
-            tool_results.append({
+        tool_results = [
+            {
                 "tool_call_id": tool_call.id,
                 "role": "tool",
-                "content": json.dumps(result)
-            })
+                "content": json_utils.dumps(result)
+            }
+            for tool_call, result in zip(tool_calls, results)
+        ]
 
         # Add tool results to session
         self.session.add_tool_results(tool_results)
 
-        # Send follow-up request with tool results
-        follow_up_response = await self.api_client.send_follow_up_request(
-            messages=self.session.get_conversation_history(),
+        # Skip the follow-up round-trip when the results already answer the request
+        direct_reply = self._format_terminal_results(tool_calls, results)
+        if direct_reply is not None:
+            self.session.add_assistant_message(direct_reply)
+            yield direct_reply
+            return
+
+        # Stream follow-up response with tool results
+        content_parts = []
+        async for chunk in self.api_client.send_follow_up_stream(
+            messages=self._windowed_history(),
             session_id=self.session.session_id
-        )
+        ):
+            content_parts.append(chunk)
+            yield chunk
 
-        final_message = follow_up_response.choices[0].message
-        self.session.add_assistant_message(final_message.content)
-
-        return final_message.content
-
-    def _log_tool_execution(self, tool_call, result):
-        """Log tool execution with result."""
-        if isinstance(result, dict) and 'success' in result:
-            if result['success']:
-                # Show successful result concisely
-                if 'current_directory' in result:
-                    self.logger.tool_execution(tool_call.function.name, result['current_directory'])
-                elif 'files' in result:
-                    file_count = len(result['files'])
-                    self.logger.tool_execution(tool_call.function.name, f"{file_count} items")
-                elif 'content' in result:
-                    content_preview = result['content'][:50] + "..." if len(result['content']) > 50 else result['content']
-                    self.logger.tool_execution(tool_call.function.name, content_preview)
-                elif 'message' in result:
-                    self.logger.tool_execution(tool_call.function.name, result['message'])
-                else:
-                    self.logger.tool_execution(tool_call.function.name, "Success")
-            else:
-                error_msg = f"Error: {result.get('error', 'Unknown error')}"
-                self.logger.tool_execution(tool_call.function.name, error_msg)
-        else:
-            result_preview = str(result)[:50] + "..." if len(str(result)) > 50 else str(result)
-            self.logger.tool_execution(tool_call.function.name, result_preview)
+        self.session.add_assistant_message("".join(content_parts))
+
+    def _format_terminal_results(self, tool_calls, results):
+        """Format successful read-only tool results as the reply, or return None."""
+        if not self.config.direct_tool_results:
+            return None
+
+        replies = []
+        for tool_call, result in zip(tool_calls, results):
+            formatter = _TERMINAL_TOOLS.get(tool_call.function.name)
+            if formatter is None or not result.get("success"):
+                return None
+            replies.append(formatter(result))
+
+        return "\n\n".join(replies)
+
+    async def _run_tool(self, tool_call):
+        """Execute a tool call in a worker thread."""
+        result = await self.file_tools.execute_tool_async(tool_call)
+
+        # Log tool usage with result using logger
+        self.logger.enqueue_tool_execution(tool_call.function.name, result)
+        return result
+
+    def _windowed_history(self):
+        """Get the conversation history trimmed to the configured sliding window."""
+        return self.session.get_conversation_history(
+            max_tokens=self.config.history_token_budget,
+            max_turns=self.config.max_history_turns
+        )
 
     def get_available_tools(self):
         """Get list of available tool names."""
-        return [tool['function']['name'] for tool in self.tools]
+        return _TOOL_NAMES
 
     def clear_history(self):
         """Clear conversation history."""
@@ -137,13 +300,12 @@ class Chatbot:
 
     async def run_goal(self, goal):
         """Run an autonomous goal-oriented task using the goal executor."""
-        # Backup current session history
-        original_history = self.session.backup_history()
-
-        try:
+        # Anything the goal adds to the session is dropped again afterwards
+        with self.session.scoped_history():
             # Use the dedicated goal executor
-            result = await self.goal_executor.execute_goal(goal, self.session.session_id)
-            return result
-        finally:
-            # Restore original conversation history
-            self.session.restore_history(original_history)
+            return await self.goal_executor.execute_goal(goal, self.session.session_id)
+
+    async def run_goals_batch(self, goals):
+        """Run many goals for scripted use, planning them together through the Batch API."""
+        with self.session.scoped_history():
+            return await self.goal_executor.execute_goals_batch(goals, self.session.session_id)
@@ -1,14 +1,57 @@
 import asyncio
+import queue
+import threading
+from typing import Optional
 from chatbot import Chatbot
 from logger import NexusLogger
 
 
+class StdinReader:
+    """Reads stdin lines on a background thread and hands them to the event loop."""
+
+    def __init__(self):
+        self._prompts = queue.SimpleQueue()
+        self._lines: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _start(self):
+        """Start the reader thread bound to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._lines = asyncio.Queue()
+        # Daemon thread so a pending read never holds up interpreter shutdown
+        self._thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._thread.start()
+
+    def _read_loop(self):
+        """Read one line per requested prompt until stdin is closed."""
+        while True:
+            prompt = self._prompts.get()
+            try:
+                line = input(prompt)
+            except Exception as e:
+                self._loop.call_soon_threadsafe(self._lines.put_nowait, e)
+                return
+            self._loop.call_soon_threadsafe(self._lines.put_nowait, line)
+
+    async def readline(self, prompt: str = "") -> str:
+        """Prompt for and return the next line without blocking the event loop."""
+        if self._thread is None:
+            self._start()
+        self._prompts.put(prompt)
+        line = await self._lines.get()
+        if isinstance(line, Exception):
+            raise line
+        return line
+
+
 class CLI:
     """Command line interface for the chatbot."""
 
     def __init__(self):
         self.chatbot = Chatbot()
         self.logger = NexusLogger()
+        self.stdin = StdinReader()
 
     def print_welcome(self):
         """Print welcome message and setup information."""
@@ -28,7 +71,7 @@ class CLI:
 
         while True:
             try:
-                user_input = input("\nYou: ").strip()
+                user_input = (await self.stdin.readline("\nYou: ")).strip()
 
                 if user_input.lower() == 'quit':
                     self.print_goodbye()
@@ -62,20 +105,51 @@ class CLI:
                         self.logger.warning("Please provide a goal after 'goal '. Example: goal Summarize all .md files into summary.md")
                     continue
 
+                if user_input.lower().startswith('goals '):
+                    goals = await self.read_lines(user_input[6:].strip())
+                    if goals:
+                        self.logger.user_input(user_input)
+                        results = await self.chatbot.run_goals_batch(goals)
+                        for goal, result in zip(goals, results):
+                            self.logger.info(f"Goal: {goal}")
+                            self.logger.info(f"Goal Result: {result}")
+                    continue
+
+                if user_input.lower().startswith('batch '):
+                    queries = await self.read_lines(user_input[6:].strip())
+                    if queries:
+                        self.logger.user_input(user_input)
+                        replies = await self.chatbot.send_messages_batch(queries)
+                        for query, reply in zip(queries, replies):
+                            self.logger.info(f"Query: {query}")
+                            self.logger.bot_response(reply)
+                    continue
+
                 if user_input:
                     self.logger.user_input(user_input)
-                    response = await self.chatbot.send_message(user_input)
-                    self.logger.bot_response(response)
+                    await self.logger.stream_bot_response(self.chatbot.stream_message(user_input))
                 else:
                     self.logger.warning("Please enter a message or type 'quit' to exit.")
 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, asyncio.CancelledError, EOFError):
                 self.print_goodbye()
                 break
             except Exception as e:
                 self.logger.error(str(e))
                 self.logger.warning("Please try again or type 'quit' to exit.")
 
+    async def read_lines(self, file_path: str) -> list:
+        """Read the non-blank lines of a file in the working directory, logging why when there are none."""
+        result = await self.chatbot.file_tools.call_tool_async("read_file", {"file_path": file_path})
+        if not result.get("success"):
+            self.logger.error(result.get("error", f"Could not read {file_path}"))
+            return []
+
+        lines = [line.strip() for line in result["content"].splitlines() if line.strip()]
+        if not lines:
+            self.logger.warning(f"No entries found in {file_path}")
+        return lines
+
     def print_session_info(self):
         """Print current session information."""
         info = self.chatbot.get_session_info()
@@ -89,6 +163,8 @@ class CLI:
             "session    - Show session information",
             "reset      - Reset session (new ID + clear history)",
             "goal <text> - Run autonomous goal (e.g., 'goal Summarize all .md files into summary.md')",
+            "goals <file> - Run each line of a file as a goal, planned together through the Batch API",
+            "batch <file> - Answer each line of a file as an independent query, several per request",
             "help       - Show this help message"
         ]
         self.logger.help_message(commands, self.chatbot.get_available_tools())
@@ -97,7 +173,8 @@ class CLI:
 async def main():
     """Entry point for the application."""
     cli = CLI()
-    await cli.run()
+    async with cli.chatbot:
+        await cli.run()
 
 
 if __name__ == "__main__":
@@ -1,41 +1,92 @@
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from dotenv import load_dotenv
-from typing import Optional
 
 # Load environment variables
 load_dotenv()
 
 
-class Config:
-    """Centralized configuration management for Nexus AI Assistant."""
+def _env_str(name: str, default: str):
+    """Build a field factory reading a string environment variable."""
+    return field(default_factory=lambda: os.getenv(name, default))
 
-    def __init__(self):
-        self._validate_required_config()
 
-    @property
-    def openai_api_key(self) -> str:
-        """Get OpenAI API key."""
-        return os.getenv('OPENAI_API_KEY', '')
+def _env_int(name: str, default: str):
+    """Build a field factory reading an integer environment variable."""
+    return field(default_factory=lambda: int(os.getenv(name, default)))
+
 
-    @property
-    def api_url(self) -> str:
-        """Get API URL."""
-        return os.getenv('API_URL', 'https://api.openai.com/v1')
+def _env_float(name: str, default: str):
+    """Build a field factory reading a float environment variable."""
+    return field(default_factory=lambda: float(os.getenv(name, default)))
 
-    @property
-    def model_name(self) -> str:
-        """Get model name."""
-        return os.getenv('MODEL_NAME', 'gpt-3.5-turbo')
 
-    @property
-    def temperature(self) -> float:
-        """Get temperature for API calls."""
-        return float(os.getenv('TEMPERATURE', '0.7'))
+def _env_bool(name: str, default: str):
+    """Build a field factory reading a boolean environment variable."""
+    return field(default_factory=lambda: os.getenv(name, default).lower() in ('1', 'true', 'yes'))
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Centralized configuration management for Nexus AI Assistant.
 
-    @property
-    def max_goal_actions(self) -> int:
-        """Get maximum actions for goal execution."""
-        return int(os.getenv('MAX_GOAL_ACTIONS', '20'))
+    Values are read from the environment once, when the instance is created.
+    """
+
+    # OpenAI API key (kept out of repr so it never ends up in logs)
+    openai_api_key: str = field(default_factory=lambda: os.getenv('OPENAI_API_KEY', ''), repr=False)
+    # API URL
+    api_url: str = _env_str('API_URL', 'https://api.openai.com/v1')
+    # Model name
+    model_name: str = _env_str('MODEL_NAME', 'gpt-3.5-turbo')
+    # Temperature for API calls
+    temperature: float = _env_float('TEMPERATURE', '0.7')
+    # Maximum actions for goal execution
+    max_goal_actions: int = _env_int('MAX_GOAL_ACTIONS', '20')
+    # Number of planning/decision responses cached per goal executor (0 disables caching)
+    response_cache_size: int = _env_int('RESPONSE_CACHE_SIZE', '256')
+    # Seconds between status checks while a Batch API job runs
+    batch_poll_interval: float = _env_float('BATCH_POLL_INTERVAL', '30')
+    # Time the Batch API is allowed to complete a batch in
+    batch_completion_window: str = _env_str('BATCH_COMPLETION_WINDOW', '24h')
+    # Number of successful plan graphs kept for reuse on recurring goals (0 disables the plan cache)
+    plan_cache_size: int = _env_int('PLAN_CACHE_SIZE', '128')
+    # Similarity from 0 to 1 above which a cached plan is adapted for a new goal
+    plan_cache_similarity: float = _env_float('PLAN_CACHE_SIMILARITY', '0.9')
+    # File the plan cache is persisted to
+    plan_cache_path: str = _env_str('PLAN_CACHE_PATH', 'logs/plan_cache.json')
+    # Whether goals are planned as a dependency graph whose independent actions run concurrently
+    parallel_goal_steps: bool = _env_bool('PARALLEL_GOAL_STEPS', 'true')
+    # Whether read-only tool results are returned without a follow-up API call
+    direct_tool_results: bool = _env_bool('DIRECT_TOOL_RESULTS', 'false')
+    # Token budget for conversation history sent per request (0 disables trimming)
+    history_token_budget: int = _env_int('HISTORY_TOKEN_BUDGET', '12000')
+    # Number of recent conversation turns sent per request (0 disables the limit)
+    max_history_turns: int = _env_int('MAX_HISTORY_TURNS', '20')
+    # Content size in characters above which older turns are summarized (0 disables summarization)
+    summary_threshold_chars: int = _env_int('SUMMARY_THRESHOLD_CHARS', '32000')
+    # Number of recent turns kept verbatim when older turns are summarized
+    summary_keep_turns: int = _env_int('SUMMARY_KEEP_TURNS', '4')
+    # Maximum number of queries combined into one batched request
+    row_marshal_batch: int = _env_int('ROW_MARSHAL_BATCH', '8')
+    # Maximum number of concurrent API requests
+    max_concurrency: int = _env_int('MAX_CONCURRENCY', '16')
+    # Number of retries for rate-limited or failed API requests
+    max_retries: int = _env_int('MAX_RETRIES', '5')
+    # Maximum number of pooled HTTP connections
+    max_conn: int = _env_int('MAX_CONN', '2000')
+    # Maximum number of keep-alive HTTP connections
+    max_keepalive: int = _env_int('MAX_KEEPALIVE', '1500')
+    # Seconds an idle keep-alive connection is kept; long enough to span the gap between goal steps
+    keepalive_expiry: float = _env_float('KEEPALIVE_EXPIRY', '30')
+    # Whether a connection to the API host is opened at startup, ahead of the first request
+    prewarm_connection: bool = _env_bool('PREWARM_CONNECTION', 'true')
+    # HTTP request timeout in seconds
+    http_timeout: float = _env_float('HTTP_TIMEOUT', '120')
+
+    def __post_init__(self):
+        self._validate_required_config()
 
     def _validate_required_config(self):
         """Validate that required configuration is present."""
@@ -49,5 +100,31 @@ class Config:
             'api_url': self.api_url,
             'model_name': self.model_name,
             'temperature': self.temperature,
-            'max_goal_actions': self.max_goal_actions
+            'max_goal_actions': self.max_goal_actions,
+            'response_cache_size': self.response_cache_size,
+            'batch_poll_interval': self.batch_poll_interval,
+            'batch_completion_window': self.batch_completion_window,
+            'plan_cache_size': self.plan_cache_size,
+            'plan_cache_similarity': self.plan_cache_similarity,
+            'plan_cache_path': self.plan_cache_path,
+            'parallel_goal_steps': self.parallel_goal_steps,
+            'direct_tool_results': self.direct_tool_results,
+            'history_token_budget': self.history_token_budget,
+            'max_history_turns': self.max_history_turns,
+            'summary_threshold_chars': self.summary_threshold_chars,
+            'summary_keep_turns': self.summary_keep_turns,
+            'row_marshal_batch': self.row_marshal_batch,
+            'max_concurrency': self.max_concurrency,
+            'max_retries': self.max_retries,
+            'max_conn': self.max_conn,
+            'max_keepalive': self.max_keepalive,
+            'keepalive_expiry': self.keepalive_expiry,
+            'prewarm_connection': self.prewarm_connection,
+            'http_timeout': self.http_timeout
         }
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the shared configuration instance."""
+    return Config()
@@ -1,11 +1,112 @@
-import json
-from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
+import json_utils
+from typing import List, Dict, Any, Optional, Awaitable, Callable, Tuple
 from api_client import OpenAIClient
 from session import Session
 from tools import FileTools
 from logger import NexusLogger
+from plan_cache import PlanCache
 from config import Config
 
+# System prompts are kept constant so every request of a kind shares the same
+# prefix, letting the provider reuse its prompt cache across iterations
+PLANNER_SYSTEM_PROMPT = "You are an autonomous AI agent. Create comprehensive plans to achieve goals."
+
+DECIDER_SYSTEM_PROMPT = """You are a goal execution agent. Analyze completed work and decide if goal is complete or what specific action comes next. Be decisive and avoid repeating completed actions.
+
+CRITICAL INSTRUCTIONS:
+1. Look at what has ALREADY been completed
+2. Determine if the goal is fully achieved based on completed actions
+3. If goal is achieved, respond with "GOAL_COMPLETE: [brief summary of what was accomplished]"
+4. If goal is NOT achieved, identify the NEXT logical step from the original plan that hasn't been done yet
+5. DO NOT repeat any action that has already been completed successfully"""
+
+PLAN_GRAPH_SYSTEM_PROMPT = """You are an autonomous AI agent. Plan how to achieve goals as a graph of actions.
+Respond with a JSON object of the form {"plan": "...", "nodes": [{"id": "n1", "action": "...", "tool": "read_file", "args": {"file_path": "notes.txt"}, "deps": []}]}.
+"plan" is a short, human-readable list of the steps. Each node is one action:
+- Set "tool" and "args" when a single tool call with arguments known up front performs the action.
+- Otherwise set "tool" to null and describe the action completely in "action".
+"deps" lists the ids of the nodes whose results the action needs; leave it empty for independent actions."""
+
+EXECUTOR_SYSTEM_PROMPT = """Execute the requested action using available tools.
+Use the available tools to complete this action.
+Be direct and efficient."""
+
+
+# Simple, unambiguous plan steps that map straight onto a file tool. Patterns
+# must match the whole action so anything with extra intent goes to the LLM.
+# A bare word only counts as a path when it looks like one (an extension, a
+# separator, or . and ..); otherwise "List files" or "Read it" would become
+# tool calls on paths named "files" and "it". Quoted names are taken as given.
+_PATH = (
+    r"(?:(?P<quote>[`'\"])(?P<quoted>[^`'\"]+)(?P=quote)"
+    r"|(?P<path>\.{1,2}|[\w.-]*\.\w+|[\w.-]*[/\\][\w./\\-]*))"
+)
+_DIRECT_ACTIONS = (
+    (re.compile(rf"(?:read|open|view|show)(?: the)?(?: contents of)?(?: the)?(?: file)? {_PATH}", re.IGNORECASE),
+     "read_file", "file_path"),
+    (re.compile(rf"list(?: the)?(?: contents of| files in)?(?: the)?(?: directory| folder)? {_PATH}", re.IGNORECASE),
+     "list_directory", "directory_path"),
+    (re.compile(r"list(?: the)?(?: files| contents)?(?: in| of)?(?: the)? current (?:directory|folder)", re.IGNORECASE),
+     "list_directory", None),
+    (re.compile(r"(?:get|show|print)(?: the)? current (?:working )?directory", re.IGNORECASE),
+     "get_current_directory", None),
+    (re.compile(rf"(?:create|make)(?: a)?(?: new)? (?:directory|folder)(?: named| called)? {_PATH}", re.IGNORECASE),
+     "create_directory", "directory_path"),
+    (re.compile(rf"(?:get|show)(?: the)? (?:file )?info(?:rmation)?(?: for| about| on)?(?: the)?(?: file)? {_PATH}", re.IGNORECASE),
+     "get_file_info", "file_path"),
+)
+
+# Leading step numbering, bullets and labels the planner tends to add, and a
+# closing full stop that isn't itself a path like "."
+_ACTION_PREFIX = re.compile(r"^\s*(?:(?:next )?(?:step|action)\s*\d*\s*:|\d+[.)]|[-*])\s*", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=\S)\.$")
+
+
+# Tool names offered to the text planner and signatures offered to the graph
+# planner, e.g. "read_file(file_path)"; the schemas are static, so build them once
+_TOOL_NAMES = ", ".join(schema['function']['name'] for schema in FileTools.SCHEMAS)
+_TOOL_SIGNATURES = ", ".join(
+    f"{schema['function']['name']}({', '.join(schema['function']['parameters'].get('properties', {}))})"
+    for schema in FileTools.SCHEMAS
+)
+
+# Static parts of the planner and decider requests, built once; the message
+# dicts are shared between requests, so they must never be mutated
+_PLANNER_MESSAGE = {"role": "system", "content": PLANNER_SYSTEM_PROMPT}
+_PLAN_GRAPH_MESSAGE = {"role": "system", "content": PLAN_GRAPH_SYSTEM_PROMPT}
+_DECIDER_MESSAGE = {"role": "system", "content": DECIDER_SYSTEM_PROMPT}
+_MASTER_PLAN_SUFFIX = f"""
+
+Available tools: {_TOOL_NAMES}
+
+Create a detailed, step-by-step plan that will accomplish the goal completely.
+List all the specific actions needed in order.
+Be thorough and consider all necessary steps.
+
+Respond with a JSON object of the form {{"plan": "...", "next_action": "..."}}, where "next_action" is the first action to perform."""
+_PLAN_GRAPH_SUFFIX = f"\n\nAvailable tools: {_TOOL_SIGNATURES}"
+
+
+def _is_goal_complete(decision: str) -> bool:
+    """Check whether a decision reports the goal as complete."""
+    decision = decision.upper()
+    return "GOAL_COMPLETE" in decision or "FINISHED" in decision
+
+
+def _tool_succeeded(result: Dict[str, Any]) -> bool:
+    """Check whether a tool result reports success."""
+    return "error" not in result and result.get("success") is not False
+
+
+def _completion_line_ended(text: str) -> bool:
+    """Check whether a decision has finished its GOAL_COMPLETE summary line."""
+    index = text.upper().find("GOAL_COMPLETE")
+    return index != -1 and "\n" in text[index:]
+
 
 class GoalExecutor:
     """Handles autonomous goal execution for Nexus AI Assistant."""
@@ -15,28 +116,95 @@ class GoalExecutor:
         self.file_tools = file_tools
         self.logger = logger
         self.config = config
-
-    async def execute_goal(self, goal: str, session_id: str) -> str:
-        """Execute an autonomous goal-oriented task."""
+        # LRU of planner completion text keyed by a hash of the request payload;
+        # only plans of goals that completed are kept
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        # Plan graphs that worked, reused when the same or a similar goal comes back
+        self._plan_cache: Optional[PlanCache] = None
+        if config.plan_cache_size > 0:
+            self._plan_cache = PlanCache(config.plan_cache_path, config.plan_cache_size, config.plan_cache_similarity)
+
+    async def execute_goal(
+        self,
+        goal: str,
+        session_id: str,
+        planned: Optional[Tuple[str, List[Dict[str, Any]]]] = None
+    ) -> str:
+        """Execute an autonomous goal-oriented task, optionally from an already planned graph."""
+        # Planner completions of this goal, cached only if the goal completes so
+        # a retry after a failure plans afresh
+        plan_completions: List[Tuple[str, str]] = []
+        result = await self._execute_goal(goal, session_id, planned, plan_completions)
+        self._settle_cached_completions(plan_completions, _is_goal_complete(result))
+        return result
+
+    async def _execute_goal(
+        self,
+        goal: str,
+        session_id: str,
+        planned: Optional[Tuple[str, List[Dict[str, Any]]]],
+        plan_completions: List[Tuple[str, str]]
+    ) -> str:
+        """Plan and run the goal, returning its final decision or an error message."""
         self.logger.goal_start(goal)
 
         try:
-            # 1. Create comprehensive plan
-            plan = await self._create_master_plan(goal, session_id)
+            # 1. Create comprehensive plan, as a graph of actions when running steps concurrently
+            nodes: List[Dict[str, Any]] = []
+            first_action: Optional[str] = None
+            if planned is not None:
+                plan, nodes = planned
+            elif self.config.parallel_goal_steps:
+                cached = await self._lookup_cached_plan(goal)
+                if cached is not None and cached[1]:
+                    # Same goal as a plan that worked before, so skip planning entirely
+                    plan, nodes = cached[0]["plan"], self._parse_plan_nodes(cached[0]["nodes"])
+                else:
+                    plan, nodes = await self._create_plan_graph(
+                        goal, session_id, cached[0] if cached else None, plan_completions
+                    )
+            if not nodes:
+                plan, first_action = await self._create_master_plan(goal, session_id, plan_completions)
             self.logger.goal_plan(plan)
             self.logger.goal_executing()
 
-            # 2. Execute until done
+            # 2. Run the graph, overlapping independent actions; the decide loop
+            # below is only needed to replan when an action fails
             max_actions = self.config.max_goal_actions
-            action_count = 0
             completed_actions = []
-
+            if nodes:
+                completed_actions, failed = await self._execute_plan_graph(nodes[:max_actions], session_id)
+            action_count = len(completed_actions)
+
+            # Summary lines are formatted once per action and reused by every later decision
+            completed_lines = [
+                self._format_completed_action(i, action_info["action"], action_info["result"])
+                for i, action_info in enumerate(completed_actions, 1)
+            ]
+
+            if nodes:
+                succeeded = not failed and len(nodes) <= max_actions
+                if succeeded:
+                    # Nodes that ran without error may still not have done what
+                    # the goal needs, so the goal is only complete once the
+                    # decider confirms it; otherwise its answer is the next action
+                    first_action = await self._decide_next_action(goal, plan, completed_lines, session_id)
+                    succeeded = _is_goal_complete(first_action)
+                await self._record_cached_plan(goal, plan, nodes, succeeded)
+                if succeeded:
+                    self.logger.goal_complete(first_action)
+                    return first_action
+
+            # 3. Decide and execute remaining actions until done
             while action_count < max_actions:
-                # Decide next action
-                next_action = await self._decide_next_action(goal, plan, completed_actions, session_id)
+                # Decide next action, unless the planner already gave the first one
+                if first_action is not None:
+                    next_action, first_action = first_action, None
+                else:
+                    next_action = await self._decide_next_action(goal, plan, completed_lines, session_id)
 
                 # Check if goal is complete
-                if "GOAL_COMPLETE" in next_action.upper() or "FINISHED" in next_action.upper():
+                if _is_goal_complete(next_action):
                     self.logger.goal_complete(next_action)
                     return next_action
 
@@ -45,12 +213,8 @@ class GoalExecutor:
                 result = await self._execute_action(next_action, session_id)
 
                 # Track completed action
-                completed_actions.append({
-                    "action": next_action,
-                    "result": result
-                })
-
                 action_count += 1
+                completed_lines.append(self._format_completed_action(action_count, next_action, result))
 
             error_msg = f"Goal execution reached maximum actions ({max_actions})"
             self.logger.error(error_msg)
@@ -61,38 +225,282 @@ class GoalExecutor:
             self.logger.error(error_msg)
             return error_msg
 
-    async def _create_master_plan(self, goal: str, session_id: str) -> str:
-        """Create a comprehensive plan for achieving the goal."""
-        plan_prompt = f"""Create a comprehensive plan to achieve this goal: {goal}
-
-Available tools: {', '.join(self._get_available_tools())}
+    async def _lookup_cached_plan(self, goal: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Look up a cached plan for the goal in a worker thread, treating cache errors as a miss."""
+        if not self._plan_cache:
+            return None
+        try:
+            return await asyncio.to_thread(self._plan_cache.lookup, goal)
+        except Exception as e:
+            self.logger.warning(f"Plan cache lookup failed: {str(e)}")
+            return None
 
-Create a detailed, step-by-step plan that will accomplish the goal completely.
-List all the specific actions needed in order.
-Be thorough and consider all necessary steps."""
+    async def _record_cached_plan(self, goal: str, plan: str, nodes: List[Dict[str, Any]], succeeded: bool) -> None:
+        """Record a plan's outcome in a worker thread; a cache error never fails the goal itself."""
+        if not self._plan_cache:
+            return
+        try:
+            await asyncio.to_thread(self._plan_cache.record, goal, plan, nodes, succeeded)
+        except Exception as e:
+            self.logger.warning(f"Plan cache update failed: {str(e)}")
+
+    async def execute_goals_batch(self, goals: List[str], session_id: str) -> List[str]:
+        """Execute many goals, planning them together through the Batch API.
+
+        Meant for scripted, offline runs: the batch trades latency (up to the
+        completion window) for lower cost and no per-request rate limits.
+        Goals whose plan is cached or missing from the batch output are
+        planned online as usual.
+        """
+        requests: Dict[str, Dict[str, Any]] = {}
+        if self.config.parallel_goal_steps:
+            for index, goal in enumerate(goals):
+                cached = await self._lookup_cached_plan(goal)
+                if cached is not None and cached[1]:
+                    continue
+                temp_messages, temperature = self._plan_graph_request(goal, cached[0] if cached else None)
+                requests[str(index)] = {
+                    "model": self.config.model_name,
+                    "messages": temp_messages,
+                    "temperature": temperature,
+                    "response_format": {"type": "json_object"},
+                    "litellm_session_id": session_id
+                }
+
+        planned: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+        if requests:
+            try:
+                bodies = await self.api_client.run_batch(requests)
+            except Exception as e:
+                self.logger.warning(f"Batch planning failed, planning goals individually: {str(e)}")
+                bodies = {}
+
+            for custom_id, body in bodies.items():
+                try:
+                    plan, nodes = self._parse_plan_graph(body["choices"][0]["message"]["content"])
+                except Exception:
+                    continue
+                if nodes:
+                    planned[custom_id] = (plan, nodes)
+
+        return await asyncio.gather(*(
+            self.execute_goal(goal, session_id, planned.get(str(index)))
+            for index, goal in enumerate(goals)
+        ))
+
+    async def _create_master_plan(
+        self,
+        goal: str,
+        session_id: str,
+        completions: Optional[List[Tuple[str, str]]] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Create a comprehensive plan for achieving the goal, along with its first action.
+
+        Getting the first action with the plan saves the first decision round
+        trip; if the response is not the expected JSON, it is used as the plan
+        text and the first action is decided as usual.
+        """
+        plan_prompt = "Create a comprehensive plan to achieve this goal: " + goal + _MASTER_PLAN_SUFFIX
+        temp_messages = [_PLANNER_MESSAGE, {"role": "user", "content": plan_prompt}]
+
+        async def fetch() -> str:
+            response = await self.api_client.send_chat_completion(
+                messages=temp_messages,
+                session_id=session_id,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+            return response.choices[0].message.content
+
+        content = await self._cached_completion(temp_messages, 0.3, fetch, completions)
+        try:
+            fused = json_utils.loads(content or "{}")
+        except ValueError:
+            return content, None
+
+        if not isinstance(fused, dict) or not isinstance(fused.get("plan"), str):
+            return content, None
+        next_action = fused.get("next_action")
+        if not isinstance(next_action, str) or not next_action.strip():
+            next_action = None
+        return fused["plan"], next_action
+
+    async def _create_plan_graph(
+        self,
+        goal: str,
+        session_id: str,
+        template: Optional[Dict[str, Any]] = None,
+        completions: Optional[List[Tuple[str, str]]] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Plan the goal as a dependency graph of actions, returning the plan text and its nodes."""
+        temp_messages, temperature = self._plan_graph_request(goal, template)
+
+        async def fetch() -> str:
+            response = await self.api_client.send_chat_completion(
+                messages=temp_messages,
+                session_id=session_id,
+                temperature=temperature,
+                response_format={"type": "json_object"}
+            )
+            return response.choices[0].message.content
 
-        temp_messages = [
-            {"role": "system", "content": "You are an autonomous AI agent. Create comprehensive plans to achieve goals."},
-            {"role": "user", "content": plan_prompt}
+        try:
+            return self._parse_plan_graph(await self._cached_completion(temp_messages, temperature, fetch, completions))
+        except Exception as e:
+            # Without a graph the text plan and decide/execute loop still drive the goal
+            self.logger.warning(f"Could not create plan graph: {str(e)}")
+            return "", []
+
+    @staticmethod
+    def _plan_graph_request(goal: str, template: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], float]:
+        """Build the graph planner messages and temperature for a goal.
+
+        When a cached plan for a similar goal is given, the planner only has
+        to adapt it, which takes a shorter, more deterministic completion.
+        """
+        plan_prompt = "Goal: " + goal + _PLAN_GRAPH_SUFFIX
+        temperature = 0.3
+        if template is not None:
+            graph = json_utils.dumps({"plan": template["plan"], "nodes": template["nodes"]})
+            plan_prompt += f"\n\nThis plan achieved a similar goal; adapt it to this goal:\n{graph}"
+            temperature = 0.1
+
+        temp_messages = [_PLAN_GRAPH_MESSAGE, {"role": "user", "content": plan_prompt}]
+        return temp_messages, temperature
+
+    @classmethod
+    def _parse_plan_graph(cls, content: Optional[str]) -> Tuple[str, List[Dict[str, Any]]]:
+        """Parse the graph planner's JSON into the plan text and validated nodes."""
+        graph = json_utils.loads(content or "{}")
+        if not isinstance(graph, dict) or not isinstance(graph.get("nodes"), list):
+            return "", []
+
+        nodes = cls._parse_plan_nodes(graph["nodes"])
+        plan = graph.get("plan")
+        if not isinstance(plan, str) or not plan.strip():
+            plan = "\n".join(f"{i}. {node['action']}" for i, node in enumerate(nodes, 1))
+        return plan, nodes
+
+    @staticmethod
+    def _parse_plan_nodes(raw_nodes: List[Any]) -> List[Dict[str, Any]]:
+        """Validate planner nodes, keeping only dependencies on earlier nodes so the graph is acyclic."""
+        nodes: List[Dict[str, Any]] = []
+        seen = set()
+        last_directory_change = None
+
+        for index, raw in enumerate(raw_nodes):
+            if not isinstance(raw, dict) or not isinstance(raw.get("action"), str) or not raw["action"].strip():
+                continue
+
+            node_id = str(raw.get("id", index))
+            if node_id in seen:
+                node_id = f"{node_id}#{index}"
+
+            tool = raw.get("tool") if raw.get("tool") in FileTools.TOOL_NAMES else None
+            args = raw.get("args") if tool and isinstance(raw.get("args"), dict) else {}
+            raw_deps = raw.get("deps") if isinstance(raw.get("deps"), list) else []
+            deps = [str(dep) for dep in raw_deps if str(dep) in seen]
+
+            # A directory change affects how later paths resolve, so it waits
+            # for everything before it and everything after waits for it
+            if tool == "change_directory":
+                deps = [node["id"] for node in nodes]
+                last_directory_change = node_id
+            elif last_directory_change is not None and last_directory_change not in deps:
+                deps.append(last_directory_change)
+
+            nodes.append({"id": node_id, "action": raw["action"].strip(), "tool": tool, "args": args, "deps": deps})
+            seen.add(node_id)
+
+        return nodes
+
+    async def _execute_plan_graph(
+        self,
+        nodes: List[Dict[str, Any]],
+        session_id: str
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Run plan nodes as soon as their dependencies finish.
+
+        Returns the completed actions in plan order and whether any node
+        failed; nodes that depend on a failed node are skipped.
+        """
+        by_id = {node["id"]: node for node in nodes}
+        results: Dict[str, str] = {}
+        failed = set()
+        # Count unfinished dependencies per node so a completion only has to
+        # look at the nodes that depend on it
+        unmet = {node["id"]: len(node["deps"]) for node in nodes}
+        dependents: Dict[str, List[str]] = {node["id"]: [] for node in nodes}
+        for node in nodes:
+            for dep in node["deps"]:
+                dependents[dep].append(node["id"])
+        running: Dict["asyncio.Task[Tuple[str, bool]]", Dict[str, Any]] = {}
+
+        def start(node: Dict[str, Any]) -> None:
+            self.logger.goal_action(node["action"])
+            context = "\n".join(f"- {by_id[dep]['action']}: {results[dep][:500]}" for dep in node["deps"])
+            running[asyncio.create_task(self._run_plan_node(node, context, session_id))] = node
+
+        def skip_dependents(node_id: str) -> None:
+            for dependent in dependents[node_id]:
+                if dependent not in failed:
+                    failed.add(dependent)
+                    skip_dependents(dependent)
+
+        for node in nodes:
+            if not node["deps"]:
+                start(node)
+
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                node = running.pop(task)
+                try:
+                    result, ok = task.result()
+                except Exception as e:
+                    result, ok = f"Action failed: {str(e)}", False
+                results[node["id"]] = result
+
+                if not ok:
+                    failed.add(node["id"])
+                    skip_dependents(node["id"])
+                    continue
+                for dependent in dependents[node["id"]]:
+                    unmet[dependent] -= 1
+                    if unmet[dependent] == 0 and dependent not in failed:
+                        start(by_id[dependent])
+
+        completed_actions = [
+            {"action": node["action"], "result": results[node["id"]]}
+            for node in nodes
+            if node["id"] in results
         ]
-
-        response = await self.api_client.send_chat_completion(
-            messages=temp_messages,
-            session_id=session_id,
-            temperature=0.3
-        )
-
-        return response.choices[0].message.content
-
-    async def _decide_next_action(self, goal: str, plan: str, completed_actions: List[Dict[str, Any]], session_id: str) -> str:
-        """Decide what action to take next based on the goal, plan, and completed actions."""
+        return completed_actions, bool(failed)
+
+    async def _run_plan_node(self, node: Dict[str, Any], context: str, session_id: str) -> Tuple[str, bool]:
+        """Run one plan node, calling its tool directly when the planner supplied one."""
+        if node["tool"] is None:
+            tool_results: List[Dict[str, Any]] = []
+            result = await self._execute_action(node["action"], session_id, context, tool_results)
+            # An action that ran no tool has nothing to show it actually took effect
+            return result, bool(tool_results) and all(map(_tool_succeeded, tool_results))
+
+        result = await self.file_tools.call_tool_async(node["tool"], node["args"])
+        self.logger.enqueue_tool_execution(node["tool"], result)
+        return json_utils.dumps(result), _tool_succeeded(result)
+
+    @staticmethod
+    def _format_completed_action(index: int, action: str, result: Any) -> str:
+        """Format one completed action and a preview of its result for the decision prompt."""
+        result = result if isinstance(result, str) else str(result)
+        result_preview = result[:100] + "..." if len(result) > 100 else result
+        return f"{index}. ✅ {action}\n   Result: {result_preview}\n"
+
+    async def _decide_next_action(self, goal: str, plan: str, completed_lines: List[str], session_id: str) -> str:
+        """Decide what action to take next based on the goal, plan, and completed action summaries."""
         completed_summary = ""
-        if completed_actions:
-            completed_summary = "\n\nCOMPLETED ACTIONS AND RESULTS:\n"
-            for i, action_info in enumerate(completed_actions, 1):
-                action = action_info['action']
-                result_preview = str(action_info['result'])[:100] + "..." if len(str(action_info['result'])) > 100 else str(action_info['result'])
-                completed_summary += f"{i}. ✅ {action}\n   Result: {result_preview}\n"
+        if completed_lines:
+            completed_summary = "\n\nCOMPLETED ACTIONS AND RESULTS:\n" + "".join(completed_lines)
 
         action_prompt = f"""GOAL: {goal}
 
@@ -100,104 +508,172 @@ ORIGINAL PLAN:
 {plan}
 {completed_summary}
 
-CRITICAL INSTRUCTIONS:
-1. Look at what has ALREADY been completed above
-2. Determine if the goal is fully achieved based on completed actions
-3. If goal is achieved, respond with "GOAL_COMPLETE: [brief summary of what was accomplished]"
-4. If goal is NOT achieved, identify the NEXT logical step from the original plan that hasn't been done yet
-5. DO NOT repeat any action that has already been completed successfully
-
 What should happen next?"""
 
-        temp_messages = [
-            {"role": "system", "content": "You are a goal execution agent. Analyze completed work and decide if goal is complete or what specific action comes next. Be decisive and avoid repeating completed actions."},
-            {"role": "user", "content": action_prompt}
-        ]
+        temp_messages = [_DECIDER_MESSAGE, {"role": "user", "content": action_prompt}]
 
-        response = await self.api_client.send_chat_completion(
+        # Never cached: the completed-action summaries don't capture the
+        # current state of the files, so an old decision may no longer hold
+        return await self.api_client.send_streaming_completion(
             messages=temp_messages,
             session_id=session_id,
-            temperature=0.1
+            temperature=0.1,
+            stop_when=_completion_line_ended
         )
 
-        return response.choices[0].message.content
+    async def _cached_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: float,
+        fetch: Callable[[], Awaitable[str]],
+        completions: Optional[List[Tuple[str, str]]] = None
+    ) -> str:
+        """Return a cached completion for an identical request, or fetch one.
+
+        A fetched completion is not cached yet; its key and content are added
+        to completions, for _settle_cached_completions to keep or drop once
+        the goal's outcome is known. Cache hits are added too, so a plan that
+        stops working is evicted.
+        """
+        if self.config.response_cache_size <= 0:
+            return await fetch()
+
+        payload = json_utils.dumps([self.config.model_name, temperature, messages])
+        key = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        content = self._response_cache.get(key)
+        if content is not None:
+            self._response_cache.move_to_end(key)
+        else:
+            content = await fetch()
+        if content and completions is not None:
+            completions.append((key, content))
+        return content
+
+    def _settle_cached_completions(self, completions: List[Tuple[str, str]], succeeded: bool) -> None:
+        """Cache a goal's planner completions if it completed, or evict them if it did not."""
+        max_size = self.config.response_cache_size
+        for key, content in completions:
+            if not succeeded:
+                self._response_cache.pop(key, None)
+                continue
+            self._response_cache[key] = content
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > max_size:
+                self._response_cache.popitem(last=False)
+
+    async def _execute_action(
+        self,
+        action: str,
+        session_id: str,
+        context: str = "",
+        tool_results: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """Execute a specific action using available tools, given the results it depends on.
+
+        The result of every tool the action ran is appended to tool_results, if given.
+        """
+        # Run simple file actions directly instead of asking the LLM to pick the tool
+        direct_result = await self._try_direct_dispatch(action, tool_results)
+        if direct_result is not None:
+            return direct_result
 
-    async def _execute_action(self, action: str, session_id: str) -> str:
-        """Execute a specific action using available tools."""
         # Create a temporary session for action execution
         temp_session = Session()
-        temp_session.add_system_message("Execute the requested action using available tools.")
-        temp_session.add_user_message(f"Execute this action: {action}\n\nUse the available tools to complete this action.\nBe direct and efficient.")
-
-        # Execute the action with tools
-        response = await self.api_client.send_chat_completion(
-            messages=temp_session.get_conversation_history(),
-            session_id=session_id,
-            tools=FileTools.get_tool_schemas()
-        )
-
-        assistant_message = response.choices[0].message
-
-        # Handle tool calls if present
-        if assistant_message.tool_calls:
-            return await self._handle_tool_calls_for_action(assistant_message.tool_calls, temp_session, session_id)
-
-        return assistant_message.content or "Action completed"
+        temp_session.add_system_message(EXECUTOR_SYSTEM_PROMPT)
+        if context:
+            temp_session.add_user_message(f"Execute this action: {action}\n\nResults of earlier actions:\n{context}")
+        else:
+            temp_session.add_user_message(f"Execute this action: {action}")
 
-    async def _handle_tool_calls_for_action(self, tool_calls: Any, temp_session: Session, session_id: str) -> str:
+        # Stream the action with tools, starting each tool call as soon as it is complete
+        parts = []
+        tool_calls = []
+        pending: List["asyncio.Task[Dict[str, Any]]"] = []
+        try:
+            async for kind, value in self.api_client.stream_chat_completion(
+                messages=temp_session.get_messages_view(),
+                session_id=session_id,
+                tools=FileTools.SCHEMAS
+            ):
+                if kind == "content":
+                    parts.append(value)
+                else:
+                    tool_calls.append(value)
+                    FileTools.dispatch_ordered(value, pending, self._run_tool)
+
+            # Handle tool calls if present
+            if tool_calls:
+                return await self._handle_tool_calls_for_action(
+                    tool_calls, pending, temp_session, session_id, tool_results
+                )
+        finally:
+            # Don't leave tool calls running when the stream fails part way
+            await FileTools.cancel_pending(pending)
+
+        return "".join(parts) or "Action completed"
+
+    async def _try_direct_dispatch(
+        self,
+        action: str,
+        tool_results: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[str]:
+        """Execute an action that maps directly onto a file tool, or return None."""
+        text = _ACTION_PREFIX.sub("", action.strip())
+        text = _SENTENCE_END.sub("", text.rstrip())
+        for pattern, tool_name, argument in _DIRECT_ACTIONS:
+            match = pattern.fullmatch(text)
+            if match is None:
+                continue
+
+            arguments = {argument: match.group("quoted") or match.group("path")} if argument else {}
+            result = await self.file_tools.call_tool_async(tool_name, arguments)
+            self.logger.enqueue_tool_execution(tool_name, result)
+            if tool_results is not None:
+                tool_results.append(result)
+            return json_utils.dumps(result)
+
+        return None
+
+    async def _handle_tool_calls_for_action(
+        self,
+        tool_calls: Any,
+        pending: List["asyncio.Task[Dict[str, Any]]"],
+        temp_session: Session,
+        session_id: str,
+        tool_results: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
         """Handle tool calls during action execution."""
         # Add assistant message with tool calls
         temp_session.add_assistant_message(None, tool_calls)
 
-        # Execute each tool call
-        tool_results = []
-        for tool_call in tool_calls:
-            result = self.file_tools.execute_tool(tool_call)
-
-            # Log tool usage
-            self._log_tool_execution(tool_call, result)
+        # Wait for the tool calls already running, keeping results in call order
+        if len(pending) == 1:
+            results = [await pending[0]]
+        else:
+            results = await asyncio.gather(*pending)
+        if tool_results is not None:
+            tool_results.extend(results)
 
-            # Add tool result
-            tool_results.append({
+        # Add tool results to session
+        temp_session.add_tool_results([
+            {
                 "tool_call_id": tool_call.id,
                 "role": "tool",
-                "content": json.dumps(result)
-            })
-
-        # Add tool results to session
-        temp_session.add_tool_results(tool_results)
+                "content": json_utils.dumps(result)
+            }
+            for tool_call, result in zip(tool_calls, results)
+        ])
 
         # Send follow-up request
         follow_up_response = await self.api_client.send_follow_up_request(
-            messages=temp_session.get_conversation_history(),
+            messages=temp_session.get_messages_view(),
             session_id=session_id
         )
 
         return follow_up_response.choices[0].message.content or "Action completed with tools"
 
-    def _log_tool_execution(self, tool_call: Any, result: Any) -> None:
-        """Log tool execution with result."""
-        if isinstance(result, dict) and 'success' in result:
-            if result['success']:
-                if 'current_directory' in result:
-                    self.logger.tool_execution(tool_call.function.name, result['current_directory'])
-                elif 'files' in result:
-                    file_count = len(result['files'])
-                    self.logger.tool_execution(tool_call.function.name, f"{file_count} items")
-                elif 'content' in result:
-                    content_preview = result['content'][:50] + "..." if len(result['content']) > 50 else result['content']
-                    self.logger.tool_execution(tool_call.function.name, content_preview)
-                elif 'message' in result:
-                    self.logger.tool_execution(tool_call.function.name, result['message'])
-                else:
-                    self.logger.tool_execution(tool_call.function.name, "Success")
-            else:
-                error_msg = f"Error: {result.get('error', 'Unknown error')}"
-                self.logger.tool_execution(tool_call.function.name, error_msg)
-        else:
-            result_preview = str(result)[:50] + "..." if len(str(result)) > 50 else str(result)
-            self.logger.tool_execution(tool_call.function.name, result_preview)
-
-    def _get_available_tools(self) -> List[str]:
-        """Get list of available tool names."""
-        return [tool['function']['name'] for tool in FileTools.get_tool_schemas()]
+    async def _run_tool(self, tool_call: Any) -> Dict[str, Any]:
+        """Execute a tool call in a worker thread."""
+        result = await self.file_tools.execute_tool_async(tool_call)
+        self.logger.enqueue_tool_execution(tool_call.function.name, result)
+        return result
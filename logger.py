@@ -1,52 +1,114 @@
 import os
+import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
 from datetime import datetime
+import sys
+import types
 from colorama import init, Fore, Back, Style
 from typing import Optional
 
-# Initialize colorama for cross-platform color support
-init(autoreset=True)
+# Color only an interactive terminal; when output is piped, blank out the
+# escape codes so console lines are built and written without them
+if sys.stdout.isatty():
+    # Initialize colorama for cross-platform color support
+    init(autoreset=True)
+else:
+    Fore, Back, Style = (
+        types.SimpleNamespace(**{name: "" for name in dir(codes) if name.isupper()})
+        for codes in (Fore, Back, Style)
+    )
+
+# File log records are written by one background listener per process, so
+# disk writes never block the event loop
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+# Console log level names mapped to a logging level and a message prefix
+_FILE_LEVELS = {
+    'DEBUG': (logging.DEBUG, ''),
+    'INFO': (logging.INFO, ''),
+    'SUCCESS': (logging.INFO, 'SUCCESS: '),
+    'ERROR': (logging.ERROR, ''),
+    'GOAL': (logging.INFO, 'GOAL: '),
+}
+
+
+def _preview(value, limit: int = 50) -> str:
+    """Shorten a value's text to limit characters, marking any truncation."""
+    text = value if isinstance(value, str) else str(value)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+# Summary formatters for successful tool results, tried in order; the
+# first key present in the result picks the formatter
+_FORMATTERS = (
+    ('current_directory', lambda result: result['current_directory']),
+    ('files', lambda result: f"{len(result['files'])} items"),
+    ('items', lambda result: f"{len(result['items'])} items"),
+    ('content', lambda result: _preview(result['content'])),
+    ('message', lambda result: result['message']),
+)
+
+
+def _summarize(result) -> str:
+    """Build a short, human-readable summary of a tool result."""
+    if not isinstance(result, dict) or 'success' not in result:
+        return _preview(result)
+
+    if not result['success']:
+        return f"Error: {result.get('error', 'Unknown error')}"
+
+    for key, formatter in _FORMATTERS:
+        if key in result:
+            return formatter(result)
+    return "Success"
+
 
 class NexusLogger:
     """Enhanced logging system for Nexus AI Assistant with colors and file logging."""
 
     def __init__(self, bot_name: str = "Nexus"):
         self.bot_name = bot_name
+        self._tool_queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
         self.setup_file_logging()
 
     def setup_file_logging(self):
         """Setup file logging to logs directory."""
+        global _log_listener
+
         # Create logs directory if it doesn't exist
         logs_dir = "logs"
         if not os.path.exists(logs_dir):
             os.makedirs(logs_dir)
 
+        self.file_logger = logging.getLogger('nexus')
+        if _log_listener is not None:
+            return
+
         # Create timestamped log file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = os.path.join(logs_dir, f"nexus_{timestamp}.log")
 
-        # Configure file logger
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-            ]
-        )
-        self.file_logger = logging.getLogger('nexus')
+        # Configure file logger, leaving the root logger untouched
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        _log_listener = logging.handlers.QueueListener(_log_queue, file_handler)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+        self.file_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        self.file_logger.setLevel(logging.DEBUG)
+        self.file_logger.propagate = False
 
     def _log_to_file(self, level: str, message: str):
         """Log message to file."""
-        if level.upper() == 'DEBUG':
-            self.file_logger.debug(message)
-        elif level.upper() == 'INFO':
-            self.file_logger.info(message)
-        elif level.upper() == 'SUCCESS':
-            self.file_logger.info(f"SUCCESS: {message}")
-        elif level.upper() == 'ERROR':
-            self.file_logger.error(message)
-        elif level.upper() == 'GOAL':
-            self.file_logger.info(f"GOAL: {message}")
+        file_level = _FILE_LEVELS.get(level.upper())
+        if file_level is not None and self.file_logger.isEnabledFor(file_level[0]):
+            self.file_logger.log(file_level[0], "%s%s", file_level[1], message)
 
     def welcome(self, model_name: str, session_id: str, tools: list):
         """Print welcome message with bot branding."""
@@ -73,6 +135,22 @@ class NexusLogger:
         print(f"\n{Fore.GREEN}{self.bot_name}:{Style.RESET_ALL} {message}")
         self._log_to_file('INFO', f"Bot response: {message}")
 
+    async def stream_bot_response(self, chunks) -> str:
+        """Print a bot response as it streams in, then log it in full."""
+        parts = []
+        async for chunk in chunks:
+            if not parts:
+                print(f"\n{Fore.GREEN}{self.bot_name}:{Style.RESET_ALL} ", end="")
+            print(chunk, end="", flush=True)
+            parts.append(chunk)
+
+        message = "".join(parts)
+        if not parts:
+            print(f"\n{Fore.GREEN}{self.bot_name}:{Style.RESET_ALL} ", end="")
+        print()
+        self._log_to_file('INFO', f"Bot response: {message}")
+        return message
+
     def info(self, message: str):
         """Print info message."""
         print(f"{Fore.BLUE}ℹ️  {message}{Style.RESET_ALL}")
@@ -121,7 +199,36 @@ class NexusLogger:
     def tool_execution(self, tool_name: str, result: str):
         """Print tool execution with result."""
         print(f"{Fore.CYAN}🔧 {tool_name}{Style.RESET_ALL} {Fore.WHITE}→{Style.RESET_ALL} {Fore.GREEN}{result}{Style.RESET_ALL}")
-        self._log_to_file('DEBUG', f"Tool executed: {tool_name} -> {result}")
+        if self.file_logger.isEnabledFor(logging.DEBUG):
+            self._log_to_file('DEBUG', f"Tool executed: {tool_name} -> {result}")
+
+    def enqueue_tool_execution(self, tool_name: str, result):
+        """Queue a tool result for logging by the background writer."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to drain the queue, so log right away
+            self.tool_execution(tool_name, _summarize(result))
+            return
+
+        if self._drain_task is None or self._drain_task.done() or self._drain_task.get_loop() is not loop:
+            self._tool_queue = asyncio.Queue()
+            self._drain_task = loop.create_task(self._drain())
+        self._tool_queue.put_nowait((tool_name, result))
+
+    async def _drain(self):
+        """Write queued tool results until cancelled."""
+        while True:
+            tool_name, result = await self._tool_queue.get()
+            try:
+                self.tool_execution(tool_name, _summarize(result))
+            finally:
+                self._tool_queue.task_done()
+
+    async def flush(self):
+        """Wait until all queued tool results have been written."""
+        if self._drain_task is not None and not self._drain_task.done():
+            await self._tool_queue.join()
 
     def session_info(self, info: dict):
         """Print session information."""
@@ -0,0 +1,128 @@
+import math
+import os
+import re
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import json_utils
+
+_WORD = re.compile(r"[\w./\\-]+")
+
+
+def _normalize(goal: str) -> str:
+    """Normalize a goal so trivially different phrasings share a cache key."""
+    return " ".join(_WORD.findall(goal.lower()))
+
+
+def _vectorize(text: str) -> Dict[str, float]:
+    """Build a unit-length bag-of-words vector for cosine similarity."""
+    counts = Counter(text.split())
+    norm = math.sqrt(sum(count * count for count in counts.values())) or 1.0
+    return {word: count / norm for word, count in counts.items()}
+
+
+class PlanCache:
+    """Persistent cache of plan graphs that completed their goals.
+
+    Goals are compared by cosine similarity of their word counts, which is
+    enough to catch the recurring, near-identical goals a CLI session sees
+    without pulling in an embedding model.
+
+    Goals run concurrently in worker threads, so every method holds a lock
+    for its whole read-modify-save.
+    """
+
+    def __init__(self, path: str, max_entries: int, threshold: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._vectors: Dict[str, Dict[str, float]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def lookup(self, goal: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Find the cached plan for the goal or the most similar one.
+
+        Returns a copy of the entry and whether it was an exact match, or None
+        when no cached goal is similar enough.
+        """
+        key = _normalize(goal)
+        vector = _vectorize(key)
+        with self._lock:
+            self._load()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return dict(self._entries[key]), True
+
+            best_key, best_score = None, self.threshold
+            for other_key, other_vector in self._vectors.items():
+                score = sum(weight * other_vector.get(word, 0.0) for word, weight in vector.items())
+                if score >= best_score:
+                    best_key, best_score = other_key, score
+
+            if best_key is None:
+                return None
+            return dict(self._entries[best_key]), False
+
+    def record(self, goal: str, plan: str, nodes: List[Dict[str, Any]], success: bool) -> None:
+        """Record how a plan did for a goal and persist the cache."""
+        with self._lock:
+            self._load()
+            key = _normalize(goal)
+            entry = self._entries.get(key)
+
+            if entry is None:
+                if not success:
+                    return
+                entry = {"goal": key, "plan": plan, "nodes": nodes, "successes": 0, "failures": 0}
+                self._entries[key] = entry
+                self._vectors[key] = _vectorize(key)
+            elif success:
+                entry["plan"], entry["nodes"] = plan, nodes
+
+            entry["successes" if success else "failures"] += 1
+            self._entries.move_to_end(key)
+
+            # Drop plans that fail more often than they work, then the least recently used
+            if entry["failures"] > entry["successes"]:
+                self._remove(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+            self._save()
+
+    def _remove(self, key: str) -> None:
+        del self._entries[key]
+        del self._vectors[key]
+
+    def _load(self) -> None:
+        """Read the cache file the first time the cache is used."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            with open(self.path, 'rb') as f:
+                entries = json_utils.loads(f.read())
+        except (OSError, ValueError):
+            return
+
+        for entry in entries if isinstance(entries, list) else []:
+            if isinstance(entry, dict) and isinstance(entry.get("goal"), str) and isinstance(entry.get("nodes"), list):
+                self._entries[entry["goal"]] = entry
+                self._vectors[entry["goal"]] = _vectorize(entry["goal"])
+
+    def _save(self) -> None:
+        """Write the cache atomically so a crash never leaves a partial file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # A unique temporary file keeps other processes sharing the cache path from clobbering it
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=directory or '.', prefix=os.path.basename(self.path) + '.', suffix='.tmp', delete=False
+        ) as f:
+            f.write(json_utils.dumps(list(self._entries.values())))
+        os.replace(f.name, self.path)
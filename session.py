@@ -1,17 +1,76 @@
 import uuid
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is optional
+    tiktoken = None
+
+# Approximate per-message token overhead added by the chat format
+MESSAGE_TOKEN_OVERHEAD = 4
+
+# Prefix marking the system message that stands in for summarized turns
+SUMMARY_PREFIX = "Summary of earlier conversation: "
+
+
+def _tool_call_text(tool_call: Any) -> str:
+    """Get the function name and arguments a tool call adds to a request."""
+    function = tool_call["function"] if isinstance(tool_call, dict) else tool_call.function
+    if isinstance(function, dict):
+        name, arguments = function.get("name"), function.get("arguments")
+    else:
+        name, arguments = function.name, function.arguments
+    if not isinstance(arguments, str):
+        arguments = str(arguments or "")
+    return (name or "") + arguments
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    """Get the text a message sends: its content plus any tool call arguments."""
+    content = message.get("content") or ""
+    if not isinstance(content, str):
+        content = str(content)
+    tool_calls = message.get("tool_calls")
+    if tool_calls:
+        # A write_file call carries the whole file in its arguments
+        content += "".join(_tool_call_text(tool_call) for tool_call in tool_calls)
+    return content
+
+
+def _get_encoder(model_name: Optional[str]):
+    """Get a tiktoken encoder for the model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model_name or "")
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
 
 
 class Session:
     """Manages conversation history and session tracking for Nexus AI Assistant."""
 
-    def __init__(self):
-        self.session_id = str(uuid.uuid4())
+    def __init__(self, model_name: Optional[str] = None):
+        self._session_id: Optional[str] = None
         self.conversation_history: List[Dict[str, Any]] = []
+        # Token estimate of each history message, parallel to the history and
+        # filled in on first use so a message is only encoded once
+        self._token_counts: List[Optional[int]] = []
+        self._message_count = 0
+        self._tool_calls_count = 0
+        self._encoder = _get_encoder(model_name)
+
+    @property
+    def session_id(self) -> str:
+        """Get the session ID, generating it on first use."""
+        if self._session_id is None:
+            self._session_id = uuid.uuid4().hex
+        return self._session_id
 
     def add_user_message(self, content: str) -> None:
         """Add a user message to conversation history."""
-        self.conversation_history.append({
+        self._append({
             "role": "user",
             "content": content
         })
@@ -25,39 +84,120 @@ class Session:
         if tool_calls:
             message["tool_calls"] = tool_calls
 
-        self.conversation_history.append(message)
+        self._append(message)
 
     def add_tool_results(self, tool_results: List[Dict[str, Any]]) -> None:
         """Add tool execution results to conversation history."""
         self.conversation_history.extend(tool_results)
+        self._token_counts.extend([None] * len(tool_results))
+        self._tool_calls_count += sum(1 for msg in tool_results if msg["role"] == "tool")
 
     def add_system_message(self, content: str) -> None:
         """Add a system message to conversation history."""
-        self.conversation_history.append({
+        self._append({
             "role": "system",
             "content": content
         })
 
-    def get_conversation_history(self) -> List[Dict[str, Any]]:
-        """Get the current conversation history."""
-        return self.conversation_history.copy()
+    def _append(self, message: Dict[str, Any]) -> None:
+        """Append a message to conversation history and update the counters."""
+        self.conversation_history.append(message)
+        self._token_counts.append(None)
+        if message["role"] in ("user", "assistant"):
+            self._message_count += 1
+        elif message["role"] == "tool":
+            self._tool_calls_count += 1
+
+    def _recount(self) -> None:
+        """Recompute the counters after the history was replaced wholesale."""
+        self._message_count = sum(1 for msg in self.conversation_history if msg["role"] in ("user", "assistant"))
+        self._tool_calls_count = sum(1 for msg in self.conversation_history if msg["role"] == "tool")
+
+    def get_conversation_history(
+        self,
+        max_tokens: Optional[int] = None,
+        max_turns: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the current conversation history, optionally trimmed to a sliding window.
+
+        When a token budget or turn limit is given, leading system messages are
+        always kept and the most recent turns are added until either limit is
+        reached. A turn starts at a user message, so tool results stay attached
+        to the assistant message that requested them.
+        """
+        if not max_tokens and not max_turns:
+            return self.conversation_history.copy()
+
+        history = self.conversation_history
+        prefix_end = 0
+        while prefix_end < len(history) and history[prefix_end]["role"] == "system":
+            prefix_end += 1
+
+        budget = None
+        if max_tokens:
+            budget = max_tokens - sum(self._count_tokens_at(i) for i in range(prefix_end))
+
+        start = len(history)
+        used = 0
+        turns = 0
+        for i in range(len(history) - 1, prefix_end - 1, -1):
+            if budget is not None:
+                used += self._count_tokens_at(i)
+            if history[i]["role"] == "user":
+                # Always keep the latest turn, even if it is over budget
+                if start < len(history) and (
+                    (budget is not None and used > budget) or (max_turns and turns >= max_turns)
+                ):
+                    break
+                start = i
+                turns += 1
+
+        return history[:prefix_end] + history[start:]
+
+    def get_messages_view(self) -> Sequence[Dict[str, Any]]:
+        """Get the conversation history without copying it.
+
+        The result is the live history, so callers must treat it as read-only
+        and use it before the session changes, e.g. to send a single request.
+        """
+        return self.conversation_history
+
+    def _count_tokens_at(self, index: int) -> int:
+        """Get the token estimate of history[index], counting it on first use."""
+        if len(self._token_counts) != len(self.conversation_history):
+            # The history list was changed from outside the session
+            self._token_counts = [None] * len(self.conversation_history)
+        count = self._token_counts[index]
+        if count is None:
+            count = self._token_counts[index] = self._count_tokens(self.conversation_history[index])
+        return count
+
+    def _count_tokens(self, message: Dict[str, Any]) -> int:
+        """Estimate the number of tokens a message contributes to a request."""
+        content = _message_text(message)
+        if self._encoder is not None:
+            return len(self._encoder.encode(content)) + MESSAGE_TOKEN_OVERHEAD
+        return len(content) // 4 + MESSAGE_TOKEN_OVERHEAD
 
     def clear_history(self) -> None:
         """Clear the conversation history."""
         self.conversation_history = []
+        self._token_counts = []
+        self._message_count = 0
+        self._tool_calls_count = 0
 
     def reset_session(self) -> str:
         """Reset session with new ID and clear history."""
-        self.session_id = str(uuid.uuid4())
-        self.conversation_history = []
+        self._session_id = None
+        self.clear_history()
         return self.session_id
 
     def get_session_info(self) -> Dict[str, Any]:
         """Get session information."""
         return {
             "session_id": self.session_id,
-            "message_count": len([msg for msg in self.conversation_history if msg["role"] in ["user", "assistant"]]),
-            "tool_calls_count": len([msg for msg in self.conversation_history if msg["role"] == "tool"])
+            "message_count": self._message_count,
+            "tool_calls_count": self._tool_calls_count
         }
 
     def backup_history(self) -> List[Dict[str, Any]]:
@@ -67,6 +207,56 @@ class Session:
     def restore_history(self, backup: List[Dict[str, Any]]) -> None:
         """Restore conversation history from backup."""
         self.conversation_history = backup.copy()
+        self._token_counts = [None] * len(self.conversation_history)
+        self._recount()
+
+    def get_content_length(self, start: int = 0, end: Optional[int] = None) -> int:
+        """Get the number of characters history[start:end] sends, by default the whole history.
+
+        Tool call arguments count along with message content.
+        """
+        return sum(len(_message_text(msg)) for msg in self.conversation_history[start:end])
+
+    def get_summarizable_range(self, keep_turns: int) -> Optional[Tuple[int, int]]:
+        """Get the (start, end) slice of history older than the last keep_turns turns.
+
+        The slice skips the leading system messages but includes an earlier
+        summary, so repeated compaction folds it into the new summary. Returns
+        None when there is nothing old enough to summarize.
+        """
+        history = self.conversation_history
+        start = 0
+        while start < len(history) and history[start]["role"] == "system":
+            start += 1
+        if start and (history[start - 1].get("content") or "").startswith(SUMMARY_PREFIX):
+            start -= 1
+
+        user_indexes = [i for i in range(start, len(history)) if history[i]["role"] == "user"]
+        if len(user_indexes) <= keep_turns:
+            return None
+        end = user_indexes[-keep_turns] if keep_turns > 0 else len(history)
+        return start, end
+
+    def replace_with_summary(self, start: int, end: int, summary: str) -> None:
+        """Replace history[start:end] with a single system message holding its summary."""
+        self.conversation_history[start:end] = [{
+            "role": "system",
+            "content": SUMMARY_PREFIX + summary
+        }]
+        self._token_counts[start:end] = [None]
+        self._recount()
+
+    @contextmanager
+    def scoped_history(self) -> Iterator[None]:
+        """Discard messages appended within the block, without copying the history."""
+        saved_length = len(self.conversation_history)
+        try:
+            yield
+        finally:
+            if len(self.conversation_history) > saved_length:
+                del self.conversation_history[saved_length:]
+                del self._token_counts[saved_length:]
+                self._recount()
 
     def create_temporary_history(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Create a temporary conversation history for specific operations."""
@@ -1,129 +1,581 @@
-import json
+import asyncio
+import codecs
+import errno
+import functools
+import logging
+import operator
 import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+import json_utils
+
+logger = logging.getLogger('nexus')
+
+# Maximum number of bytes returned by read_file; larger files are truncated
+MAX_READ_BYTES = 65536
+
+# Bytes read_file reads and decodes first, so non-UTF-8 files fail fast
+_HEAD_BYTES = min(8192, MAX_READ_BYTES)
+
+# Open flags for raw file I/O; O_BINARY only exists (and matters) on Windows
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+_DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+
+# Whether scandir accepts a directory descriptor (POSIX only)
+_SCANDIR_FD = os.scandir in os.supports_fd
+
+# Whether file tools can work relative to a descriptor held on the current directory
+_USE_DIR_FD = {os.open, os.stat} <= os.supports_dir_fd
+
+# Fields get_file_info reads, for os.statx (Python 3.15+ on Linux); None where it's missing
+_STATX_MASK = (
+    os.STATX_TYPE | os.STATX_MODE | os.STATX_UID | os.STATX_GID
+    | os.STATX_SIZE | os.STATX_ATIME | os.STATX_MTIME | os.STATX_CTIME
+    if hasattr(os, 'statx') else None
+)
+
+# Effective user and groups of the process, for deciding access from stat
+# results; None on platforms without POSIX ids
+if hasattr(os, 'geteuid'):
+    _EUID = os.geteuid()
+    _GROUPS = frozenset(os.getgroups()) | {os.getegid()}
+else:
+    _EUID = _GROUPS = None
+
+# Sort key for directory entries, evaluated once per entry in C
+_BY_NAME = operator.attrgetter('name')
+
+# Worker threads for file tools, kept apart from the loop's default executor so
+# file I/O never queues behind DNS lookups and other blocking calls
+IO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+_io_executor = None
+
+
+def _get_io_executor():
+    """Get the shared file I/O thread pool, creating it on first use."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='nexus-io')
+    return _io_executor
+
+
+def _write_bytes(path, data, dir_fd=None):
+    """Write data to path with unbuffered os-level calls, replacing any existing content."""
+    fd = os.open(path, _WRITE_FLAGS, 0o666, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _stat_metadata(path, dir_fd=None):
+    """Stat path for get_file_info, letting network filesystems answer from cached attributes.
+
+    statx with AT_STATX_DONT_SYNC fetches only the fields get_file_info
+    reports and skips the server round trip some filesystems make to sync
+    them. Where statx is unavailable this is a plain os.stat.
+    """
+    if _STATX_MASK is not None:
+        try:
+            return os.statx(path, _STATX_MASK, flags=os.AT_STATX_DONT_SYNC, dir_fd=dir_fd)
+        except OSError as e:
+            # Kernels before 4.11 and some sandboxes reject statx itself
+            if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.EPERM):
+                raise
+    return os.stat(path, dir_fd=dir_fd)
+
+
+def _as_flag(value, default):
+    """Coerce a model-supplied boolean argument, which may arrive as a string or number."""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ("false", "0", "no", "off"):
+            return False
+        if value in ("true", "1", "yes", "on"):
+            return True
+        return default
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    return default
+
+
+def _access_flags(path, stat_info):
+    """Get whether path is readable, writable and executable for this process.
+
+    On POSIX this reads the permission bits from the stat result already
+    fetched instead of making three access() calls. ACLs and read-only
+    mounts are not taken into account.
+    """
+    if _EUID is None:
+        return os.access(path, os.R_OK), os.access(path, os.W_OK), os.access(path, os.X_OK)
+
+    mode = stat_info.st_mode
+    if _EUID == 0:
+        # root bypasses permission bits, except that a file needs some execute bit
+        return True, True, stat.S_ISDIR(mode) or bool(mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH))
+
+    if stat_info.st_uid == _EUID:
+        bits = mode >> 6
+    elif stat_info.st_gid in _GROUPS:
+        bits = mode >> 3
+    else:
+        bits = mode
+    return bool(bits & 4), bool(bits & 2), bool(bits & 1)
+
+
+class _WorkingDir:
+    """Snapshot of the current directory: its resolved path, prefix and descriptor.
+
+    Snapshots are never changed while in use. Each tool call holds one for
+    its whole run, so change_directory can publish the next snapshot without
+    closing a descriptor that a running call still has, and every call sees
+    a path prefix and descriptor that belong together.
+    """
+
+    __slots__ = ("path", "prefix", "fd", "_lock", "_users", "_retired")
+
+    def __init__(self, path, hold_fd=True):
+        self.path = path
+        self.prefix = path.rstrip(os.sep) + os.sep
+        # Holding the directory open lets file tools name paths relative to it,
+        # sparing the kernel a walk from the root on every call
+        self.fd = os.open(path, _DIR_FLAGS) if hold_fd and _USE_DIR_FD else None
+        self._lock = threading.Lock()
+        self._users = 0
+        self._retired = False
+
+    def acquire(self):
+        """Register a tool call using the snapshot, or return False if it has been replaced."""
+        with self._lock:
+            if self._retired:
+                return False
+            self._users += 1
+            return True
+
+    def release(self):
+        """End a tool call's use of the snapshot, closing it if it was the last user of a replaced one."""
+        with self._lock:
+            self._users -= 1
+            if self._retired and self._users == 0:
+                self._close()
+
+    def retire(self):
+        """Mark the snapshot replaced; its descriptor closes once no tool call uses it."""
+        with self._lock:
+            self._retired = True
+            if self._users == 0:
+                self._close()
+
+    def _close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def relative(self, path):
+        """Get a path string relative to the directory, or unchanged if it lies outside.
+
+        Plain prefix slicing, since paths from _safe_path are already joined
+        onto the directory and need no pathlib parsing.
+        """
+        if path == self.path:
+            return "."
+        if path.startswith(self.prefix):
+            return path[len(self.prefix):]
+        return path
+
+    def fd_path(self, path):
+        """Get the name to pass alongside dir_fd=self.fd for a path from _safe_path."""
+        return self.relative(path) if self.fd is not None else path
+
+
+def _with_working_dir(method):
+    """Run a tool method with the current directory snapshot passed in and held for the call."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._working_dir() as cwd:
+            return method(self, cwd, *args, **kwargs)
+    return wrapper
 
 
 class FileTools:
     """File system operations with security checks."""
 
+    # OpenAI function schemas for file tools, built once per process
+    SCHEMAS = [
+        {
+            "type": "function",
+            "function": {
+                "name": "read_file",
+                "description": "Read the contents of a file from the file system",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "file_path": {
+                            "type": "string",
+                            "description": "The path to the file to read"
+                        }
+                    },
+                    "required": ["file_path"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "write_file",
+                "description": "Write content to a file in the file system",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "file_path": {
+                            "type": "string",
+                            "description": "The path to the file to write to"
+                        },
+                        "content": {
+                            "type": "string",
+                            "description": "The content to write to the file"
+                        }
+                    },
+                    "required": ["file_path", "content"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "list_directory",
+                "description": "List the contents of a directory with file and folder information",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "directory_path": {
+                            "type": "string",
+                            "description": "The path to the directory to list (defaults to current directory if not provided)"
+                        },
+                        "detail": {
+                            "type": "boolean",
+                            "description": "Whether to include each item's size and modification time (defaults to true); set to false when only names and types are needed"
+                        }
+                    },
+                    "required": []
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_current_directory",
+                "description": "Get the current working directory path",
+                "parameters": {
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "change_directory",
+                "description": "Change the current working directory to a specified path",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "directory_path": {
+                            "type": "string",
+                            "description": "The path to the directory to change to"
+                        }
+                    },
+                    "required": ["directory_path"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "create_directory",
+                "description": "Create a new directory at the specified path",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "directory_path": {
+                            "type": "string",
+                            "description": "The path where the new directory should be created"
+                        }
+                    },
+                    "required": ["directory_path"]
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_file_info",
+                "description": "Get detailed information about a file or directory including size, permissions, and timestamps",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "file_path": {
+                            "type": "string",
+                            "description": "The path to the file or directory to get information about"
+                        }
+                    },
+                    "required": ["file_path"]
+                }
+            }
+        }
+    ]
+
+    TOOL_NAMES = frozenset(schema["function"]["name"] for schema in SCHEMAS)
+
+    # Tools that change the file system or the working directory; the rest
+    # only read and can safely overlap with each other
+    MUTATING_TOOLS = frozenset({"write_file", "create_directory", "change_directory"})
+
     def __init__(self, current_dir=None):
-        self.current_dir = current_dir or Path.cwd()
+        # Parent directories already created or seen by write_file
+        self._known_parents = set()
+        # Serializes directory changes; tool calls only read the published snapshot
+        self._cwd_lock = threading.Lock()
+        self._cwd = None
+        self._set_current_dir(current_dir or Path.cwd())
+
+    @property
+    def current_dir(self):
+        """The resolved current directory."""
+        return Path(self._cwd.path)
+
+    def _set_current_dir(self, path, resolved=False):
+        """Publish a new current directory snapshot for safety checks and relative access.
+
+        Pass resolved=True when path already comes from realpath to skip resolving it again.
+        """
+        path = os.fspath(path) if resolved else os.path.realpath(path)
+        self._publish(_WorkingDir(path))
+        # The directory was just resolved, so writes directly into it need no mkdir
+        self._known_parents.add(path)
+
+    def _publish(self, cwd):
+        with self._cwd_lock:
+            old, self._cwd = self._cwd, cwd
+        if old is not None:
+            old.retire()
+
+    def close(self):
+        """Release the descriptor held on the current directory."""
+        # Later calls still work, just through absolute paths
+        self._publish(_WorkingDir(self._cwd.path, hold_fd=False))
+
+    @contextmanager
+    def _working_dir(self):
+        """Hold the current directory snapshot for the duration of one tool call."""
+        cwd = self._cwd
+        while not cwd.acquire():
+            # A directory change replaced it in the meantime, so use the new one
+            cwd = self._cwd
+        try:
+            yield cwd
+        finally:
+            cwd.release()
+
+    @staticmethod
+    def _safe_path(cwd, file_path):
+        """Get the path relative to the current directory, or None if it escapes it.
 
-    def _is_safe_path(self, file_path):
-        """Check if the file path is within the current directory for security."""
+        The result is a plain string, so callers that only pass it on to os
+        functions never build a Path. It is unresolved, so names and symlinks
+        are reported as given.
+        """
         try:
-            # Convert to absolute path and resolve any .. or . components
-            abs_path = Path(file_path).resolve()
-            # Check if the path is within current directory
-            return str(abs_path).startswith(str(self.current_dir.resolve()))
+            # Make path relative to current directory if it's not absolute
+            path = os.path.join(cwd.path, os.fspath(file_path))
+            # Compare on a separator boundary so /tmp/dir2 doesn't match /tmp/dir.
+            # Normalizing is pure string work, so .. escapes are rejected
+            # without touching the filesystem.
+            if not (os.path.normpath(path) + os.sep).startswith(cwd.prefix):
+                return None
+            # A symlink inside the directory may still point outside it
+            if not (os.path.realpath(path) + os.sep).startswith(cwd.prefix):
+                return None
         except Exception:
-            return False
+            return None
+        return path
 
-    def read_file(self, file_path):
+    @_with_working_dir
+    def read_file(self, cwd, file_path):
         """Read file contents with safety checks."""
-        if not self._is_safe_path(file_path):
+        path = self._safe_path(cwd, file_path)
+        if path is None:
             return {"error": "Access denied: File path is outside current directory"}
 
         try:
-            path = Path(file_path)
-            if not path.exists():
+            try:
+                fd = os.open(cwd.fd_path(path), _READ_FLAGS, dir_fd=cwd.fd)
+            except FileNotFoundError:
                 return {"error": f"File not found: {file_path}"}
 
-            if not path.is_file():
-                return {"error": f"Path is not a file: {file_path}"}
-
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            try:
+                # One fstat replaces the exists and is_file checks, and its size
+                # lets small files come back in a single read. Read one byte past
+                # the limit to detect truncation without loading the whole file.
+                stat_info = os.fstat(fd)
+                if not stat.S_ISREG(stat_info.st_mode):
+                    return {"error": f"Path is not a file: {file_path}"}
+                # Pseudo-files report a size of 0, so read those up to the limit
+                wanted = min(stat_info.st_size or MAX_READ_BYTES, MAX_READ_BYTES) + 1
+
+                # Decode the first block before reading the rest, so a binary
+                # file is rejected after one small read
+                head = os.read(fd, min(wanted, _HEAD_BYTES))
+                try:
+                    content = decoder.decode(head)
+                except UnicodeDecodeError:
+                    return {"error": f"File is not valid UTF-8 text: {file_path}"}
+                rest = os.read(fd, wanted - len(head)) if len(head) == _HEAD_BYTES < wanted else b""
+            finally:
+                os.close(fd)
+
+            size = len(head) + len(rest)
+            truncated = size > MAX_READ_BYTES
+            if truncated:
+                rest = rest[:MAX_READ_BYTES - len(head)]
+                size = MAX_READ_BYTES
+
+            # A truncated read may end mid character, so only a complete read is final
+            try:
+                content += decoder.decode(rest, final=not truncated)
+            except UnicodeDecodeError:
+                return {"error": f"File is not valid UTF-8 text: {file_path}"}
 
-            return {"success": True, "content": content, "file_path": str(path)}
+            return {
+                "success": True,
+                "content": content,
+                # Echo the path as the caller gave it; the joined path goes alongside
+                "file_path": os.fspath(file_path),
+                "absolute_path": path,
+                "truncated": truncated,
+                "bytes": size
+            }
 
         except PermissionError:
             return {"error": f"Permission denied: {file_path}"}
         except Exception as e:
             return {"error": f"Error reading file: {str(e)}"}
 
-    def write_file(self, file_path, content):
+    def _ensure_parent(self, path):
+        """Create the parent directories of path unless they are known to exist."""
+        parent = os.path.dirname(path)
+        if not parent or parent == path or parent in self._known_parents:  # Avoid creating parent for root
+            return
+        os.makedirs(parent, exist_ok=True)
+        self._known_parents.add(parent)
+
+    @_with_working_dir
+    def write_file(self, cwd, file_path, content):
         """Write file contents with safety checks."""
         try:
-            # Debug: Print current directory and file path
-            print(f"  🔍 Current directory: {self.current_dir}")
-            print(f"  🔍 Requested file path: {file_path}")
-            print(f"  🔍 Content type: {type(content)}")
-            print(f"  🔍 Content value: {repr(content)}")
-
             # Ensure content is a string
             if content is None:
                 content = ""
             elif not isinstance(content, str):
                 content = str(content)
 
-            if not self._is_safe_path(file_path):
-                return {"error": "Access denied: File path is outside current directory"}
-
-            path = Path(file_path)
-
-            # Make path relative to current directory if it's not absolute
-            if not path.is_absolute():
-                path = self.current_dir / path
-
-            print(f"  🔍 Resolved path: {path}")
+            logger.debug("write_file: path=%s cwd=%s length=%d", file_path, cwd.path, len(content))
 
-            # Create parent directories if they don't exist
-            if path.parent != path:  # Avoid creating parent for root
-                path.parent.mkdir(parents=True, exist_ok=True)
-                print(f"  📁 Created directories: {path.parent}")
+            path = self._safe_path(cwd, file_path)
+            if path is None:
+                return {"error": "Access denied: File path is outside current directory"}
 
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            data = content.encode('utf-8')
+            try:
+                self._ensure_parent(path)
+                _write_bytes(cwd.fd_path(path), data, cwd.fd)
+            except FileNotFoundError:
+                # A cached parent may have been removed since, so recreate it once
+                self._known_parents.discard(os.path.dirname(path))
+                self._ensure_parent(path)
+                _write_bytes(cwd.fd_path(path), data, cwd.fd)
 
-            return {"success": True, "message": f"File written successfully: {file_path}", "file_path": str(path)}
+            return {"success": True, "message": f"File written successfully: {file_path}", "file_path": path}
 
         except PermissionError as e:
             return {"error": f"Permission denied: {file_path} - {str(e)}"}
         except Exception as e:
             return {"error": f"Error writing file: {str(e)} (path: {file_path})"}
 
-    def list_directory(self, directory_path="."):
-        """List contents of a directory with file/folder information."""
+    @_with_working_dir
+    def list_directory(self, cwd, directory_path=".", detail=True):
+        """List contents of a directory with file/folder information.
+
+        Without detail, items only carry their name, type and path, which
+        scandir provides without a single stat() call per entry.
+        """
         try:
-            # Use current directory if no path provided
-            if directory_path == ".":
-                directory_path = str(self.current_dir)
-            
-            if not self._is_safe_path(directory_path):
+            path = self._safe_path(cwd, directory_path)
+            if path is None:
                 return {"error": "Access denied: Directory path is outside current directory"}
-
-            path = Path(directory_path)
-            
-            # Make path relative to current directory if it's not absolute
-            if not path.is_absolute():
-                path = self.current_dir / path
-                
-            if not path.exists():
+            # Drop "." segments and trailing slashes so entry paths come out clean;
+            # this also turns an empty directory_path into the current directory
+            path = os.path.normpath(path)
+
+            # One stat answers both whether the path exists and whether it's a directory
+            try:
+                stat_info = os.stat(cwd.fd_path(path), dir_fd=cwd.fd)
+            except (FileNotFoundError, NotADirectoryError):
                 return {"error": f"Directory not found: {directory_path}"}
 
-            if not path.is_dir():
+            if not stat.S_ISDIR(stat_info.st_mode):
                 return {"error": f"Path is not a directory: {directory_path}"}
 
-            items = []
-            for item in sorted(path.iterdir()):
-                try:
-                    stat_info = item.stat()
-                    item_info = {
-                        "name": item.name,
-                        "type": "directory" if item.is_dir() else "file",
-                        "size": stat_info.st_size if item.is_file() else None,
-                        "modified": stat_info.st_mtime,
-                        "path": str(item.relative_to(self.current_dir)) if str(item).startswith(str(self.current_dir)) else str(item)
-                    }
-                    items.append(item_info)
-                except (PermissionError, OSError):
-                    # Skip items we can't access
-                    continue
+            # Entry paths are reported relative to the current directory
+            relative_dir = cwd.relative(path)
+            entry_prefix = relative_dir + os.sep if relative_dir != "." else ""
+
+            # Scanning through a directory descriptor turns each entry's stat()
+            # into an fstatat() relative to it, so the kernel does not walk the
+            # directory's own path again for every entry
+            dir_fd = os.open(cwd.fd_path(path), _DIR_FLAGS, dir_fd=cwd.fd) if _SCANDIR_FD else None
+            try:
+                # scandir entries carry the file type from the directory listing,
+                # so each entry costs at most the one stat() for size and mtime
+                with os.scandir(path if dir_fd is None else dir_fd) as it:
+                    entries = sorted(it, key=_BY_NAME)
+
+                items = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                        item_path = entry_prefix + entry.name
+                        if not detail:
+                            items.append({"name": entry.name, "type": "directory" if is_dir else "file", "path": item_path})
+                            continue
+
+                        stat_info = entry.stat()
+                        item_info = {
+                            "name": entry.name,
+                            "type": "directory" if is_dir else "file",
+                            "size": stat_info.st_size if not is_dir and entry.is_file() else None,
+                            "modified": stat_info.st_mtime,
+                            "path": item_path
+                        }
+                        items.append(item_info)
+                    except (PermissionError, OSError):
+                        # Skip items we can't access
+                        continue
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
 
             return {
                 "success": True,
-                "directory": str(path.relative_to(self.current_dir)) if str(path).startswith(str(self.current_dir)) else str(path),
+                "directory": relative_dir,
                 "items": items,
                 "total_items": len(items)
             }
@@ -136,43 +588,44 @@ class FileTools:
     def get_current_directory(self):
         """Get the current working directory."""
         try:
+            # The snapshot is read once, so both fields name the same directory
+            path = self._cwd.path
             return {
                 "success": True,
-                "current_directory": str(self.current_dir),
-                "absolute_path": str(self.current_dir.resolve())
+                "current_directory": path,
+                # current_dir is resolved whenever it is set
+                "absolute_path": path
             }
         except Exception as e:
             return {"error": f"Error getting current directory: {str(e)}"}
 
-    def change_directory(self, directory_path):
+    @_with_working_dir
+    def change_directory(self, cwd, directory_path):
         """Change the current working directory."""
         try:
-            if not self._is_safe_path(directory_path):
+            path = self._safe_path(cwd, directory_path)
+            if path is None:
                 return {"error": "Access denied: Directory path is outside allowed scope"}
 
-            path = Path(directory_path)
-            
-            # Make path relative to current directory if it's not absolute
-            if not path.is_absolute():
-                path = self.current_dir / path
-                
-            path = path.resolve()
-            
-            if not path.exists():
+            path = os.path.realpath(path)
+
+            try:
+                stat_info = os.stat(path)
+            except (FileNotFoundError, NotADirectoryError):
                 return {"error": f"Directory not found: {directory_path}"}
 
-            if not path.is_dir():
+            if not stat.S_ISDIR(stat_info.st_mode):
                 return {"error": f"Path is not a directory: {directory_path}"}
 
             # Update current directory
-            old_dir = str(self.current_dir)
-            self.current_dir = path
+            old_dir = cwd.path
+            self._set_current_dir(path, resolved=True)
             
             return {
                 "success": True,
-                "message": f"Changed directory from {old_dir} to {str(path)}",
+                "message": f"Changed directory from {old_dir} to {path}",
                 "old_directory": old_dir,
-                "new_directory": str(path)
+                "new_directory": path
             }
 
         except PermissionError:
@@ -180,27 +633,24 @@ class FileTools:
         except Exception as e:
             return {"error": f"Error changing directory: {str(e)}"}
 
-    def create_directory(self, directory_path):
+    @_with_working_dir
+    def create_directory(self, cwd, directory_path):
         """Create a new directory."""
         try:
-            if not self._is_safe_path(directory_path):
+            path = self._safe_path(cwd, directory_path)
+            if path is None:
                 return {"error": "Access denied: Directory path is outside current directory"}
 
-            path = Path(directory_path)
-            
-            # Make path relative to current directory if it's not absolute
-            if not path.is_absolute():
-                path = self.current_dir / path
-
-            if path.exists():
+            # makedirs reports an existing path itself, so there's no need to stat it first
+            try:
+                os.makedirs(path)
+            except FileExistsError:
                 return {"error": f"Directory already exists: {directory_path}"}
-
-            path.mkdir(parents=True, exist_ok=False)
             
             return {
                 "success": True,
                 "message": f"Directory created successfully: {directory_path}",
-                "directory_path": str(path)
+                "directory_path": path
             }
 
         except PermissionError:
@@ -208,41 +658,41 @@ class FileTools:
         except Exception as e:
             return {"error": f"Error creating directory: {str(e)}"}
 
-    def get_file_info(self, file_path):
+    @_with_working_dir
+    def get_file_info(self, cwd, file_path):
         """Get detailed information about a file or directory."""
         try:
-            if not self._is_safe_path(file_path):
+            path = self._safe_path(cwd, file_path)
+            if path is None:
                 return {"error": "Access denied: File path is outside current directory"}
+            # Drop "." segments and trailing slashes so the name and path come out clean
+            path = os.path.normpath(path)
 
-            path = Path(file_path)
-            
-            # Make path relative to current directory if it's not absolute
-            if not path.is_absolute():
-                path = self.current_dir / path
-
-            if not path.exists():
+            # The one stat also provides the type checks below
+            try:
+                stat_info = _stat_metadata(cwd.fd_path(path), cwd.fd)
+            except (FileNotFoundError, NotADirectoryError):
                 return {"error": f"Path not found: {file_path}"}
+            is_readable, is_writable, is_executable = _access_flags(path, stat_info)
 
-            stat_info = path.stat()
-            
             info = {
                 "success": True,
-                "name": path.name,
-                "path": str(path.relative_to(self.current_dir)) if str(path).startswith(str(self.current_dir)) else str(path),
-                "absolute_path": str(path.resolve()),
-                "type": "directory" if path.is_dir() else "file",
+                "name": os.path.basename(path),
+                "path": cwd.relative(path),
+                "absolute_path": os.path.realpath(path),
+                "type": "directory" if stat.S_ISDIR(stat_info.st_mode) else "file",
                 "size": stat_info.st_size,
                 "created": stat_info.st_ctime,
                 "modified": stat_info.st_mtime,
                 "accessed": stat_info.st_atime,
                 "permissions": oct(stat_info.st_mode)[-3:],
-                "is_readable": os.access(path, os.R_OK),
-                "is_writable": os.access(path, os.W_OK),
-                "is_executable": os.access(path, os.X_OK)
+                "is_readable": is_readable,
+                "is_writable": is_writable,
+                "is_executable": is_executable
             }
             
-            if path.is_file():
-                info["extension"] = path.suffix
+            if stat.S_ISREG(stat_info.st_mode):
+                info["extension"] = os.path.splitext(path)[1]
                 
             return info
 
@@ -254,145 +704,85 @@ class FileTools:
     def execute_tool(self, tool_call):
         """Execute a tool call and return the result."""
         function_name = tool_call.function.name
-        arguments = json.loads(tool_call.function.arguments)
-
-        if function_name == "read_file":
-            return self.read_file(arguments.get("file_path"))
-        elif function_name == "write_file":
-            return self.write_file(arguments.get("file_path"), arguments.get("content"))
-        elif function_name == "list_directory":
-            return self.list_directory(arguments.get("directory_path", "."))
-        elif function_name == "get_current_directory":
+
+        # Reject unknown tools before paying for argument parsing
+        if function_name not in self.TOOL_NAMES:
+            return {"error": f"Unknown function: {function_name}"}
+
+        if function_name == "get_current_directory":
             return self.get_current_directory()
-        elif function_name == "change_directory":
-            return self.change_directory(arguments.get("directory_path"))
-        elif function_name == "create_directory":
-            return self.create_directory(arguments.get("directory_path"))
-        elif function_name == "get_file_info":
-            return self.get_file_info(arguments.get("file_path"))
+
+        arguments = tool_call.function.arguments
+        # Some clients hand arguments over already parsed, so only decode JSON text
+        if not isinstance(arguments, dict):
+            try:
+                arguments = json_utils.loads(arguments or "{}")
+            except ValueError as e:
+                return {"error": f"Invalid arguments for {function_name}: {str(e)}"}
+            # Every tool takes an object, so any other JSON value can't be dispatched
+            if not isinstance(arguments, dict):
+                return {"error": f"Invalid arguments for {function_name}: expected a JSON object"}
+        return self.call_tool(function_name, arguments)
+
+    async def execute_tool_async(self, tool_call):
+        """Execute a tool call on the file I/O thread pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_io_executor(), self.execute_tool, tool_call)
+
+    @classmethod
+    def dispatch_ordered(cls, tool_call, pending, run):
+        """Start run(tool_call) as a task appended to pending, ordered against the earlier calls.
+
+        A mutating call waits for every call before it, and a read waits for
+        the latest mutating call, so only runs of reads execute concurrently.
+        """
+        name = tool_call.function.name
+        if name in cls.MUTATING_TOOLS:
+            after = list(pending)
         else:
+            after = [task for task in pending if task.get_name() in cls.MUTATING_TOOLS][-1:]
+
+        async def ordered():
+            if after:
+                await asyncio.wait(after)
+            return await run(tool_call)
+
+        pending.append(asyncio.create_task(ordered(), name=name))
+
+    @staticmethod
+    async def cancel_pending(pending):
+        """Cancel dispatched tool calls that have not finished and wait for them to settle."""
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def call_tool_async(self, function_name, arguments):
+        """Run a tool by name on the file I/O thread pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_io_executor(), self.call_tool, function_name, arguments)
+
+    # Tool name -> handler taking the instance and the parsed arguments
+    _HANDLERS = {
+        "get_current_directory": lambda tools, arguments: tools.get_current_directory(),
+        "read_file": lambda tools, arguments: tools.read_file(arguments.get("file_path")),
+        "write_file": lambda tools, arguments: tools.write_file(arguments.get("file_path"), arguments.get("content")),
+        "list_directory": lambda tools, arguments: tools.list_directory(
+            arguments.get("directory_path") or ".", _as_flag(arguments.get("detail"), True)
+        ),
+        "change_directory": lambda tools, arguments: tools.change_directory(arguments.get("directory_path")),
+        "create_directory": lambda tools, arguments: tools.create_directory(arguments.get("directory_path")),
+        "get_file_info": lambda tools, arguments: tools.get_file_info(arguments.get("file_path")),
+    }
+
+    def call_tool(self, function_name, arguments):
+        """Run a tool by name with already parsed arguments and return the result."""
+        handler = self._HANDLERS.get(function_name)
+        if handler is None:
             return {"error": f"Unknown function: {function_name}"}
+        return handler(self, arguments)
 
     @staticmethod
     def get_tool_schemas():
         """Return the OpenAI function schemas for file tools."""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "read_file",
-                    "description": "Read the contents of a file from the file system",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "The path to the file to read"
-                            }
-                        },
-                        "required": ["file_path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "write_file",
-                    "description": "Write content to a file in the file system",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "The path to the file to write to"
-                            },
-                            "content": {
-                                "type": "string",
-                                "description": "The content to write to the file"
-                            }
-                        },
-                        "required": ["file_path", "content"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "list_directory",
-                    "description": "List the contents of a directory with file and folder information",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "The path to the directory to list (defaults to current directory if not provided)"
-                            }
-                        },
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_current_directory",
-                    "description": "Get the current working directory path",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "change_directory",
-                    "description": "Change the current working directory to a specified path",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "The path to the directory to change to"
-                            }
-                        },
-                        "required": ["directory_path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "create_directory",
-                    "description": "Create a new directory at the specified path",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "The path where the new directory should be created"
-                            }
-                        },
-                        "required": ["directory_path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_file_info",
-                    "description": "Get detailed information about a file or directory including size, permissions, and timestamps",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "The path to the file or directory to get information about"
-                            }
-                        },
-                        "required": ["file_path"]
-                    }
-                }
-            }
-        ]
\ No newline at end of file
+        return FileTools.SCHEMAS